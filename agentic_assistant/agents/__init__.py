@@ -4,5 +4,5 @@ Package initialization for agents.
 This ensures the package can be properly imported.
 """
 
-# Import registry so that auto-discovery happens on import
+# Agent modules are discovered lazily, on the first registry lookup
 from . import registry
@@ -1,9 +1,17 @@
 # agents/deep_search.py
 """Deep search agent with atomic ID tracking."""
 
-from agentic_assistant.chat_controller import ChatController
+import asyncio
+import contextvars
+import re
+
+from agentic_assistant import log
+from agentic_assistant.llm_client import parse_json_response
 from .registry import agent
 
+# Planning line with an optional leading list dash
+_ASPECT_RE = re.compile(r'^\s*-?\s*(\S.*?)\s*$')
+
 @agent(
     name="deep_search",
     description="Performs comprehensive web research on specific topics",
@@ -21,107 +29,166 @@ Focus on being thorough and objective in your research."""
 class DeepSearchAgent:
     def __init__(self, system_prompt):
         """Initialize with a dedicated chat controller"""
+        # Imported here so discovering agents does not load the LLM stack
+        from agentic_assistant.chat_controller import ChatController
+        
         self.controller = ChatController()
         self.controller.add_system_prompt(system_prompt)
     
     def process(self, topic, parent_call_id=None, depth=0, **kwargs):
         """Process a deep search task with atomic ID tracking"""
-        try:
-            print(f"\n[Deep search agent processing: \"{topic}\"]")
+        return asyncio.run(self.process_async(topic, parent_call_id=parent_call_id, depth=depth, **kwargs))
+    
+    async def _execute_tool(self, tool_name, tool_args, parent_call_id=None, depth=0):
+        """Run a tool call without blocking the event loop, passing tracking information"""
+        if parent_call_id:
+            tool_args['_parent_call_id'] = parent_call_id
+            tool_args['_depth'] = depth
+        
+        return await self.controller.tool_manager.execute_tool_async(tool_name, tool_args)
+    
+    async def _process_message_async(self, message):
+        """Run a blocking LLM call in the executor, in a copy of the context so its progress joins the turn's log"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, contextvars.copy_context().run, self.controller.process_message, message)
+    
+    async def _plan_aspects(self, topic, parent_call_id=None, depth=0):
+        """Stream the planning response and start a search for each aspect as soon as its line is complete"""
+        planning_prompt = f"Break down this research topic into 2-3 key aspects to investigate: '{topic}'"
+        
+        loop = asyncio.get_running_loop()
+        lines = asyncio.Queue()
+        
+        def read_plan():
+            """Read the planning stream in a worker thread and hand over complete lines"""
+            buffer = ""
+            try:
+                for chunk in self.controller.stream_message(planning_prompt):
+                    buffer += chunk
+                    *complete_lines, buffer = buffer.split('\n')
+                    for line in complete_lines:
+                        loop.call_soon_threadsafe(lines.put_nowait, line)
+                loop.call_soon_threadsafe(lines.put_nowait, buffer)
+            finally:
+                # Signal the end of the plan
+                loop.call_soon_threadsafe(lines.put_nowait, None)
+        
+        reader = loop.run_in_executor(None, contextvars.copy_context().run, read_plan)
+        
+        log.info("\n[Deep search planning aspects to research:]")
+        aspects = []
+        search_tasks = []
+        while True:
+            line = await lines.get()
+            if line is None:
+                break
             
-            # Planning phase
-            planning_prompt = f"Break down this research topic into 2-3 key aspects to investigate: '{topic}'"
-            planning_response = self.controller.process_message(planning_prompt)
+            match = _ASPECT_RE.match(line)
+            if not match or len(aspects) >= 3:  # Limit to 3 aspects
+                continue
+            
+            # Start searching this aspect while the rest of the plan is generated
+            aspect = match.group(1)
+            aspects.append(aspect)
+            log.info(f"  {len(aspects)}. {aspect}")
+            search_tasks.append(asyncio.ensure_future(
+                self._execute_tool("search_web", {"query": aspect, "count": 3}, parent_call_id, depth)
+            ))
+        
+        await reader
+        return aspects, search_tasks
+    
+    async def _fetch_sources(self, searches, parent_call_id=None, depth=0):
+        """Read the top 2 results of every (topic, aspect, search_result) concurrently"""
+        # Collect the top 2 results of every aspect, once per topic and URL
+        fetches = []
+        seen_sources = set()
+        for topic, aspect, search_result in searches:
+            if "error" not in search_result and "results" in search_result:
+                for result in search_result.get("results", [])[:2]:
+                    if "url" in result and (topic, result["url"]) not in seen_sources:
+                        seen_sources.add((topic, result["url"]))
+                        fetches.append((topic, aspect, result))
+        
+        # Extract content from every distinct page concurrently
+        urls = list(dict.fromkeys(result["url"] for _, _, result in fetches))
+        content_results = await asyncio.gather(*[
+            self._execute_tool("webpage_reader", {"url": url}, parent_call_id, depth)
+            for url in urls
+        ], return_exceptions=True)
+        content_by_url = dict(zip(urls, content_results))
+        
+        results = []
+        for topic, aspect, result in fetches:
+            content_result = content_by_url[result["url"]]
+            if isinstance(content_result, Exception):
+                log.info(f"Error extracting content: {str(content_result)}")
+                continue
             
-            # Verify planning response exists
-            if not planning_response or not hasattr(planning_response, 'content'):
-                return {
-                    "error": "Failed to plan research aspects",
-                    "topic": topic
-                }
+            if "error" not in content_result:
+                results.append({
+                    "topic": topic,
+                    "aspect": aspect,
+                    "title": result.get("title", "Unknown title"),
+                    "url": result.get("url", "Unknown URL"),
+                    "content": content_result.get("content", "")[:1500]  # Limit content size
+                })
+        
+        return results
+    
+    @staticmethod
+    def _format_sources(results, start=1):
+        """Format research results as numbered SOURCE blocks for a synthesis prompt"""
+        return [
+            f"\n\nSOURCE {i}: {result['title']} ({result['url']})\nAspect: {result['aspect']}\n{result['content'][:500]}...\n"
+            for i, result in enumerate(results, start)
+        ]
+    
+    async def process_async(self, topic, parent_call_id=None, depth=0, **kwargs):
+        """Process a deep search task, researching all aspects concurrently"""
+        try:
+            log.info(f"\n[Deep search agent processing: \"{topic}\"]")
             
-            # Extract search aspects
-            aspects_text = planning_response.content
-            aspects = [line.strip().replace('- ', '') for line in aspects_text.split('\n') if line.strip()]
-            aspects = aspects[:3]  # Limit to 3 aspects
+            # Plan the research, searching each aspect as soon as it is parsed
+            aspects, search_tasks = await self._plan_aspects(topic, parent_call_id, depth)
             
             if not aspects:
                 aspects = [topic]  # Use the original topic if no aspects were identified
+                search_tasks = [asyncio.ensure_future(
+                    self._execute_tool("search_web", {"query": topic, "count": 3}, parent_call_id, depth)
+                )]
             
-            # Log the aspects that will be researched
-            print(f"\n[Deep search identified {len(aspects)} aspects to research:]")
-            for i, aspect in enumerate(aspects):
-                print(f"  {i+1}. {aspect}")
-            
-            # Research each aspect
-            results = []
+            # Wait for the searches that were started during planning
+            log.info(f"\n[Researching {len(aspects)} aspects concurrently]")
+            search_results = await asyncio.gather(*search_tasks)
             
-            for i, aspect in enumerate(aspects):
-                print(f"\n[Researching aspect {i+1}/{len(aspects)}: \"{aspect}\"]")
-                
-                # Pass tracking information
-                search_args = {"query": aspect, "count": 3}
-                if parent_call_id:
-                    search_args['_parent_call_id'] = parent_call_id
-                    search_args['_depth'] = depth
-                
-                # Execute search
-                search_result = self.controller.tool_manager.execute_tool(
-                    "search_web", 
-                    search_args
-                )
-                
-                if "error" not in search_result and "results" in search_result:
-                    # Process the top 2 results
-                    for j, result in enumerate(search_result.get("results", [])[:2]):
-                        try:
-                            # Pass tracking information
-                            url_args = {"url": result["url"]}
-                            if parent_call_id:
-                                url_args['_parent_call_id'] = parent_call_id
-                                url_args['_depth'] = depth
-                            
-                            # Extract content
-                            content_result = self.controller.tool_manager.execute_tool(
-                                "webpage_reader", 
-                                url_args
-                            )
-                            
-                            if "error" not in content_result:
-                                results.append({
-                                    "aspect": aspect,
-                                    "title": result.get("title", "Unknown title"),
-                                    "url": result.get("url", "Unknown URL"),
-                                    "content": content_result.get("content", "")[:1500]  # Limit content size
-                                })
-                        except Exception as e:
-                            print(f"Error extracting content: {str(e)}")
+            # Extract content from the top results of every aspect
+            results = await self._fetch_sources(
+                [(topic, aspect, search_result) for aspect, search_result in zip(aspects, search_results)],
+                parent_call_id,
+                depth
+            )
             
             # Create a synthesis prompt with the gathered information
-            synthesis_prompt = f"""Based on the following research, provide a comprehensive summary about: {topic}
+            parts = [f"""Based on the following research, provide a comprehensive summary about: {topic}
 
 Research findings:
-"""
-            
-            for i, result in enumerate(results):
-                synthesis_prompt += f"\n\nSOURCE {i+1}: {result['title']} ({result['url']})\nAspect: {result['aspect']}\n{result['content'][:500]}...\n"
+"""]
+            parts.extend(self._format_sources(results))
+            synthesis_prompt = "".join(parts)
             
-            print(f"\n[Synthesizing findings from {len(results)} sources]")
+            log.info(f"\n[Synthesizing findings from {len(results)} sources]")
                 
-            # Generate the summary
-            synthesis_response = self.controller.process_message(synthesis_prompt)
+            # Generate the summary off the event loop, which keeps serving other tool calls
+            synthesis_response = await self._process_message_async(synthesis_prompt)
             
-            # Get summary content safely
-            summary = "No summary could be generated."
-            if synthesis_response and hasattr(synthesis_response, 'content'):
-                summary = synthesis_response.content
+            # Get summary content
+            summary = synthesis_response.content or "No summary could be generated."
             
             # Calculate tokens used
-            tokens_used = 0
-            if hasattr(self.controller, 'total_tokens_used'):
-                tokens_used = self.controller.total_tokens_used
+            tokens_used = self.controller.total_tokens_used
             
-            print(f"\n[Deep search completed on: \"{topic}\"]")
+            log.info(f"\n[Deep search completed on: \"{topic}\"]")
             
             return {
                 "topic": topic,
@@ -132,9 +199,92 @@ Research findings:
                 "_tool_status": f"✓ Completed deep search on '{topic}' with {len(results)} sources"
             }
         except Exception as e:
-            print(f"Deep search error: {e}")
+            log.info(f"Deep search error: {e}")
             return {
                 "error": f"Error in deep_search: {str(e)}",
                 "topic": topic,
                 "_tool_status": f"❌ Deep search failed: {str(e)}"
             }
+    
+    def batch_process(self, topics, parent_call_id=None, depth=0, **kwargs):
+        """Process several deep search tasks with one planning and one synthesis LLM call"""
+        return asyncio.run(self.batch_process_async(topics, parent_call_id=parent_call_id, depth=depth, **kwargs))
+    
+    async def batch_process_async(self, topics, parent_call_id=None, depth=0, **kwargs):
+        """Research several topics at once, sharing the LLM calls and running every search concurrently"""
+        try:
+            log.info(f"\n[Deep search agent batch processing {len(topics)} topics]")
+            
+            # Plan all topics in a single call
+            numbered_topics = "\n".join(f"{i+1}. {topic}" for i, topic in enumerate(topics))
+            planning_prompt = f"""For each of the following research topics, break it down into 2-3 key aspects to investigate.
+Respond only with JSON in the form [{{"topic": "...", "aspects": ["...", "..."]}}], one entry per topic, in the same order.
+
+Topics:
+{numbered_topics}"""
+            # LLM calls block, so they run in the executor to keep the event loop free
+            planning_response = await self._process_message_async(planning_prompt)
+            plans = parse_json_response(planning_response.content)
+            
+            aspects_by_topic = []
+            for i, topic in enumerate(topics):
+                aspects = []
+                if isinstance(plans, list) and i < len(plans) and isinstance(plans[i], dict):
+                    aspects = [str(aspect).strip() for aspect in plans[i].get("aspects", []) if str(aspect).strip()]
+                aspects_by_topic.append(aspects[:3] or [topic])  # Limit to 3 aspects, default to the topic
+            
+            # Search every aspect of every topic concurrently
+            planned = [(topic, aspect) for topic, aspects in zip(topics, aspects_by_topic) for aspect in aspects]
+            log.info(f"\n[Researching {len(planned)} aspects concurrently]")
+            search_results = await asyncio.gather(*[
+                self._execute_tool("search_web", {"query": aspect, "count": 3}, parent_call_id, depth)
+                for _, aspect in planned
+            ])
+            
+            results = await self._fetch_sources(
+                [(topic, aspect, search_result) for (topic, aspect), search_result in zip(planned, search_results)],
+                parent_call_id,
+                depth
+            )
+            
+            # Synthesize all topics in a single call
+            parts = [f"""Based on the following research, provide a comprehensive summary for each of these topics:
+{numbered_topics}
+
+Respond only with JSON in the form [{{"topic": "...", "summary": "..."}}], one entry per topic, in the same order.
+"""]
+            source_number = 1
+            for topic in topics:
+                topic_results = [result for result in results if result["topic"] == topic]
+                parts.append(f"\n\nResearch findings for: {topic}")
+                parts.extend(self._format_sources(topic_results, source_number))
+                source_number += len(topic_results)
+            
+            log.info(f"\n[Synthesizing findings from {len(results)} sources]")
+            synthesis_response = await self._process_message_async("".join(parts))
+            synthesis_text = synthesis_response.content
+            summaries = parse_json_response(synthesis_text)
+            
+            tokens_used = self.controller.total_tokens_used
+            
+            batch_results = []
+            for i, (topic, aspects) in enumerate(zip(topics, aspects_by_topic)):
+                # Fall back to the raw synthesis if it could not be split per topic
+                summary = synthesis_text or "No summary could be generated."
+                if isinstance(summaries, list) and len(summaries) == len(topics) and isinstance(summaries[i], dict):
+                    summary = summaries[i].get("summary") or summary
+                
+                topic_results = [result for result in results if result["topic"] == topic]
+                batch_results.append({
+                    "topic": topic,
+                    "summary": summary,
+                    "sources": [{"title": r.get("title", "Unknown"), "url": r.get("url", "Unknown")} for r in topic_results],
+                    "aspects_researched": aspects,
+                    "tokens_used": tokens_used
+                })
+            
+            log.info(f"\n[Deep search batch completed on {len(topics)} topics]")
+            return batch_results
+        except Exception as e:
+            log.info(f"Deep search error: {e}")
+            return [{"error": f"Error in deep_search: {str(e)}", "topic": topic} for topic in topics]
@@ -1,7 +1,6 @@
 # agents/query_improver.py
 """Query improvement agent with atomic ID tracking."""
 
-from agentic_assistant.chat_controller import ChatController
 from .registry import agent
 
 @agent(
@@ -18,6 +17,9 @@ Return only the improved query without explanations or commentary."""
 class QueryImproverAgent:
     def __init__(self, system_prompt):
         """Initialize with a dedicated chat controller"""
+        # Imported here so discovering agents does not load the LLM stack
+        from agentic_assistant.chat_controller import ChatController
+        
         self.controller = ChatController()
         self.controller.add_system_prompt(system_prompt)
     
@@ -3,11 +3,20 @@
 
 import os
 import importlib
+import pkgutil
+
+from agentic_assistant import log
 
 # Storage for registered agents
 AGENTS = {}
 _agents_discovered = False
 
+# Formatted agent descriptions, rebuilt only after an agent is (re)registered
+_description_cache = None
+
+# Modules of this package that do not define agents
+_NON_AGENT_MODULES = frozenset({"registry", "base_agent", "_agent_manifest"})
+
 def agent(name, description, system_prompt):
     """
     Decorator to register an agent class.
@@ -21,6 +30,8 @@ def agent(name, description, system_prompt):
         Decorator function
     """
     def decorator(agent_class):
+        global _description_cache
+        _description_cache = None
         AGENTS[name] = {
             "class": agent_class,
             "description": description,
@@ -40,14 +51,19 @@ def get_agent(name):
     Returns:
         Agent instance or None if not found
     """
-    if name not in AGENTS:
+    if not _agents_discovered:
+        discover_agents()
+    
+    entry = AGENTS.get(name)
+    if entry is None:
         return None
     
     # Create instance if needed
-    if AGENTS[name]["instance"] is None:
-        AGENTS[name]["instance"] = AGENTS[name]["class"](AGENTS[name]["system_prompt"])
+    instance = entry["instance"]
+    if instance is None:
+        instance = entry["instance"] = entry["class"](entry["system_prompt"])
     
-    return AGENTS[name]["instance"]
+    return instance
 
 def get_agents_description():
     """
@@ -56,8 +72,25 @@ def get_agents_description():
     Returns:
         String with all agent descriptions
     """
-    return "\n".join([f"- {name}: {info['description']}" 
-                     for name, info in AGENTS.items()])
+    global _description_cache
+    if not _agents_discovered:
+        discover_agents()
+    
+    if _description_cache is None:
+        _description_cache = "\n".join([f"- {name}: {info['description']}" 
+                                         for name, info in AGENTS.items()])
+    return _description_cache
+
+def _agent_module_names():
+    """List agent module names, preferring the manifest generated at build time."""
+    try:
+        from ._agent_manifest import AGENT_MODULES
+        return AGENT_MODULES
+    except ImportError:
+        # Source checkout or editable install: scan the package directory
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        return [module.name for module in pkgutil.iter_modules([current_dir])
+                if module.name not in _NON_AGENT_MODULES]
 
 def discover_agents():
     """Automatically discover agent implementations."""
@@ -65,21 +98,12 @@ def discover_agents():
     if _agents_discovered:
         return
     
-    # Get the agent directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Import all Python files in the directory
-    for filename in os.listdir(current_dir):
-        if filename.endswith('.py') and filename != '__init__.py' and filename != 'registry.py' and filename != 'base_agent.py':
-            # Import the module
-            module_name = filename[:-3]
-            try:
-                importlib.import_module(f".{module_name}", package="agentic_assistant.agents")
-                print(f"✓ Registered agent module: {module_name}")
-            except Exception as e:
-                print(f"❌ Error importing agent module {module_name}: {str(e)}")
+    # Import all agent modules
+    for module_name in _agent_module_names():
+        try:
+            importlib.import_module(f".{module_name}", package=__package__)
+            log.info(f"✓ Registered agent module: {module_name}")
+        except Exception as e:
+            log.info(f"❌ Error importing agent module {module_name}: {str(e)}")
     
     _agents_discovered = True
-
-# Auto-discover agents on import
-discover_agents()
@@ -1,15 +1,19 @@
 # assistant.py
 """Core assistant with tool integration and agent capabilities."""
 
-import datetime
+import asyncio
+import logging
 import sys
 from typing import Dict, List, Any, Optional, Tuple
 
 from agentic_assistant.chat_controller import ChatController
 from agentic_assistant.tool_manager import ToolManager
-from agentic_assistant.prompt import SYSTEM_PROMPT
+from agentic_assistant.prompt import SYSTEM_PROMPT_STATIC, SYSTEM_PROMPT_DYNAMIC_TEMPLATE
 from agentic_assistant.config import CHAT_PROVIDER, UI_SETTINGS
 from agentic_assistant.callbacks import callbacks, Events
+from agentic_assistant.llm_client import parse_json_response
+from agentic_assistant.utils_numeric import bar_fill
+from agentic_assistant.log import TurnLogger
 
 
 class Assistant:
@@ -40,18 +44,17 @@ class Assistant:
     def _setup_system_prompt(self):
         """Set up the system prompt with agent capabilities."""
         try:
-            from agentic_assistant.agents.registry import discover_agents, get_agents_description
-            discover_agents()
+            from agentic_assistant.agents.registry import get_agents_description
             agent_descriptions = get_agents_description()
         except ImportError:
             agent_descriptions = "No specialized agents available."
             
-        # Format and add system prompt
-        formatted_prompt = SYSTEM_PROMPT.format(
-            current_date=datetime.datetime.now().strftime('%A, %B %d, %Y'),
+        # Static prefix first so it stays cacheable, volatile fields after it
+        self.controller.add_static_system_prompt(SYSTEM_PROMPT_STATIC)
+        self.controller.add_dynamic_context(
+            SYSTEM_PROMPT_DYNAMIC_TEMPLATE,
             agent_descriptions=agent_descriptions
         )
-        self.controller.add_system_prompt(formatted_prompt)
     
     def _on_response_complete(self, content, **kwargs):
         """Callback when a response is complete."""
@@ -75,14 +78,37 @@ class Assistant:
         # Reset current response
         self.current_response = None
         
-        # Process the message through the controller
-        response = self.controller.process_message(question)
+        # Process the message through the controller, flushing progress output once at the end
+        with TurnLogger():
+            response = self.controller.process_message(question)
         
         # Update current response
         self.current_response = response.content
         
         return response.content
     
+    async def ask_async(self, question: str) -> str:
+        """Process a question in a worker thread so the event loop stays responsive."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.ask, question)
+    
+    def ask_batch(self, questions: List[str]) -> List[str]:
+        """Answer several questions with a single conversation turn, one answer per question."""
+        if not questions:
+            return []
+        
+        numbered_questions = "\n".join(f"{i+1}. {question}" for i, question in enumerate(questions))
+        answers = parse_json_response(self.ask(
+            "Answer each of the following questions. Respond only with a JSON array of strings "
+            f"containing the answers, in the same order as the questions.\n\n{numbered_questions}"
+        ))
+        
+        if isinstance(answers, list) and len(answers) == len(questions):
+            return [str(answer) for answer in answers]
+        
+        # The batched answer could not be split, ask the questions one by one
+        return [self.ask(question) for question in questions]
+    
     def print_response(self, text: str):
         """Print the response."""
         print(text)
@@ -105,7 +131,7 @@ class Assistant:
         
         # Create visual bar
         bar_length = 20
-        filled_length = int(bar_length * percentage / 100)
+        filled_length = bar_fill(percentage, bar_length)
         bar = '█' * filled_length + '░' * (bar_length - filled_length)
         
         return f"Context: {bar} {tokens_used}/{context_size} tokens ({percentage:.1f}%)"
@@ -136,6 +162,11 @@ class Assistant:
     
     def start_interactive(self):
         """Start an interactive chat session in the console."""
+        asyncio.run(self.start_interactive_async())
+    
+    async def start_interactive_async(self):
+        """Run the interactive chat session on an event loop, reading input off the loop thread."""
+        loop = asyncio.get_running_loop()
         model_name = CHAT_PROVIDER.get("model", "unknown")
         context_size = CHAT_PROVIDER.get("context_size", 4096)
         
@@ -149,7 +180,7 @@ class Assistant:
         
         while True:
             # Get user input
-            user_input = input("\n🙋 You: ").strip()
+            user_input = (await loop.run_in_executor(None, input, "\n🙋 You: ")).strip()
             
             # Handle commands
             if user_input.lower() in ["exit", "quit"]:
@@ -177,7 +208,7 @@ class Assistant:
             
             try:
                 # Get response
-                response = self.ask(user_input)
+                response = await self.ask_async(user_input)
                 
                 # Print response
                 print("\n🤖 Assistant:", end=" ")
@@ -203,5 +234,6 @@ class Assistant:
 
 def main():
     """Entry point for the agentic assistant console application."""
+    logging.basicConfig(level=UI_SETTINGS.get("log_level", "WARNING"), format="%(levelname)s %(name)s: %(message)s")
     assistant = Assistant()
     assistant.start_interactive()
@@ -0,0 +1,169 @@
+# cache.py
+"""Exact-match and semantic cache for LLM responses."""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from agentic_assistant import config
+from agentic_assistant import serialization
+from agentic_assistant.utils_numeric import cosine_topk
+
+# Semantic matching needs an embedding model
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Older config files have no RESPONSE_CACHE section; the cache is then disabled
+RESPONSE_CACHE = getattr(config, "RESPONSE_CACHE", {})
+
+
+class ResponseCache:
+    """LRU cache of LLM responses keyed by a hash of the conversation, with optional semantic lookup."""
+
+    def __init__(self, max_entries=256, semantic=False, similarity_threshold=0.95,
+                 embedding_model="all-MiniLM-L6-v2"):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+
+        if semantic and not SEMANTIC_CACHE_AVAILABLE:
+            logger.warning("Semantic cache needs 'sentence-transformers' and 'numpy'. Using exact matching only.")
+        self.semantic = semantic and SEMANTIC_CACHE_AVAILABLE
+        self._embedding_model_name = embedding_model
+        self._model = None
+
+        # Normalized embeddings of cached queries, grouped by the hash of the
+        # conversation before the query and stacked into a matrix per group on lookup
+        self._embeddings: Dict[str, Any] = {}
+        self._contexts: Dict[str, str] = {}
+        self._matrices: Dict[str, Any] = {}
+
+    @staticmethod
+    def hash_messages(messages: List[Dict[str, Any]]) -> str:
+        """Hash a conversation into a cache key."""
+        payload = serialization.dumps(messages, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, messages_hash: str, query: Optional[str] = None,
+            context_hash: Optional[str] = None) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            messages_hash: Key from hash_messages for the exact conversation
+            query: Last user turn, used for semantic matching when enabled
+            context_hash: hash_messages of the conversation before the query; semantic
+                matches must share it, so follow-up questions only match in their own conversation
+
+        Returns:
+            The cached response or None on a miss
+        """
+        with self._lock:
+            response = self._entries.get(messages_hash)
+            if response is not None:
+                self._entries.move_to_end(messages_hash)
+                self.hits += 1
+                return response
+
+        if self.semantic and query and context_hash:
+            response = self._get_similar(query, context_hash)
+            if response is not None:
+                with self._lock:
+                    self.hits += 1
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, messages_hash: str, response: Any, query: Optional[str] = None,
+            context_hash: Optional[str] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            messages_hash: Key from hash_messages for the exact conversation
+            response: The LLM response to cache
+            query: Last user turn, indexed for semantic matching when enabled
+            context_hash: hash_messages of the conversation before the query
+        """
+        embedding = self._embed(query) if self.semantic and query and context_hash else None
+
+        with self._lock:
+            self._entries[messages_hash] = response
+            self._entries.move_to_end(messages_hash)
+
+            if embedding is not None:
+                self._embeddings[messages_hash] = embedding
+                self._contexts[messages_hash] = context_hash
+                self._matrices.pop(context_hash, None)
+
+            # Evict least recently used entries
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                if self._embeddings.pop(evicted_key, None) is not None:
+                    self._matrices.pop(self._contexts.pop(evicted_key), None)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._embeddings.clear()
+            self._contexts.clear()
+            self._matrices.clear()
+
+    def _embed(self, text: str):
+        """Embed a query as a normalized vector."""
+        if self._model is None:
+            self._model = SentenceTransformer(self._embedding_model_name)
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    def _get_similar(self, query: str, context_hash: str) -> Optional[Any]:
+        """Find the cached response, in the same conversation context, whose query is most similar to this one."""
+        with self._lock:
+            if context_hash not in self._contexts.values():
+                return None
+
+        query_vector = self._embed(query)
+
+        with self._lock:
+            matrix = self._matrices.get(context_hash)
+            if matrix is None:
+                keys = [key for key, context in self._contexts.items() if context == context_hash]
+                if not keys:
+                    return None
+                matrix = (keys, np.vstack([self._embeddings[key] for key in keys]))
+                self._matrices[context_hash] = matrix
+            keys, vectors = matrix
+
+            indices, scores = cosine_topk(vectors, query_vector, 1)
+            if scores[0] < self.similarity_threshold:
+                return None
+
+            key = keys[int(indices[0])]
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+
+# Global instance, None when the cache is disabled in config
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE.get("max_entries", 256),
+    semantic=RESPONSE_CACHE.get("semantic", False),
+    similarity_threshold=RESPONSE_CACHE.get("similarity_threshold", 0.95),
+    embedding_model=RESPONSE_CACHE.get("embedding_model", "all-MiniLM-L6-v2")
+) if RESPONSE_CACHE.get("enabled", False) else None
@@ -4,7 +4,12 @@ Simple callback registry for the agent system.
 Provides a lightweight alternative to a full event system.
 """
 
-from typing import Dict, List, Callable, Any
+import asyncio
+import functools
+import inspect
+from typing import Dict, Tuple, Callable, Any
+
+from agentic_assistant import log
 
 
 class CallbackManager:
@@ -12,28 +17,80 @@ class CallbackManager:
     
     def __init__(self):
         """Initialize an empty callback registry."""
-        self._callbacks: Dict[str, List[Callable]] = {}
+        # Tuples are rebuilt on (rare) registration so triggering iterates a ready-made sequence
+        self._callbacks: Dict[str, Tuple[Callable, ...]] = {}
     
     def register(self, event_name: str, callback_fn: Callable) -> None:
         """Register a callback function for a specific event."""
-        if event_name not in self._callbacks:
-            self._callbacks[event_name] = []
-        self._callbacks[event_name].append(callback_fn)
+        self._callbacks[event_name] = self._callbacks.get(event_name, ()) + (callback_fn,)
     
     def trigger(self, event_name: str, **data) -> None:
-        """Trigger an event with the given data."""
-        for callback in self._callbacks.get(event_name, []):
+        """
+        Trigger an event with the given data.
+        
+        When called from a running event loop, callbacks are scheduled instead of
+        run inline: coroutine callbacks as tasks, plain ones in the default executor.
+        """
+        cbs = self._callbacks.get(event_name)
+        if not cbs:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            for index, cb in enumerate(cbs):
+                if inspect.iscoroutinefunction(cb):
+                    future = loop.create_task(cb(**data))
+                else:
+                    future = loop.run_in_executor(None, functools.partial(cb, **data))
+                future.add_done_callback(functools.partial(self._report_failure, event_name, index))
+            return
+        
+        # One try block around the loop; on failure, log and resume after the failing callback
+        index = 0
+        count = len(cbs)
+        while index < count:
             try:
-                callback(**data)
+                for index in range(index, count):
+                    result = cbs[index](**data)
+                    if inspect.iscoroutine(result):
+                        asyncio.run(result)
+                return
             except Exception as e:
-                print(f"Error in callback for {event_name}: {str(e)}")
+                log.info(f"Error in callback #{index} for {event_name}: {str(e)}")
+                index += 1
+    
+    async def trigger_async(self, event_name: str, **data) -> None:
+        """Trigger an event and wait for every callback, running plain ones in the default executor."""
+        cbs = self._callbacks.get(event_name)
+        if not cbs:
+            return
+        
+        loop = asyncio.get_running_loop()
+        for index, cb in enumerate(cbs):
+            try:
+                if inspect.iscoroutinefunction(cb):
+                    await cb(**data)
+                else:
+                    await loop.run_in_executor(None, functools.partial(cb, **data))
+            except Exception as e:
+                log.info(f"Error in callback #{index} for {event_name}: {str(e)}")
+    
+    @staticmethod
+    def _report_failure(event_name: str, index: int, future) -> None:
+        """Log the error of a callback scheduled by trigger."""
+        if not future.cancelled() and future.exception() is not None:
+            log.info(f"Error in callback #{index} for {event_name}: {str(future.exception())}")
     
     def clear(self, event_name: str = None) -> None:
         """Clear callbacks for a specific event or all events."""
         if event_name is None:
             self._callbacks = {}
         elif event_name in self._callbacks:
-            self._callbacks[event_name] = []
+            self._callbacks[event_name] = ()
 
 
 # Global callback manager instance for convenience
@@ -1,11 +1,22 @@
 # chat_controller.py
 """Simplified chat controller for agent interactions with cleaner tool support."""
 
+import contextvars
 import datetime
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from agentic_assistant.config import CHAT_PROVIDER, TOOL_SETTINGS
 from agentic_assistant.llm_client import LLMClient
 from agentic_assistant.tool_manager import ToolManager
 from agentic_assistant.callbacks import callbacks, Events
+from agentic_assistant.cache import response_cache
+from agentic_assistant.prompt import render_prompt_cached
+
+# Worker threads for running independent tool calls concurrently, shared by every
+# controller (one per agent) so agents do not each keep their own idle threads
+_tool_pool = ThreadPoolExecutor(
+    max_workers=TOOL_SETTINGS.get("max_concurrency", 8),
+    thread_name_prefix="tool"
+)
 
 
 class ChatController:
@@ -25,9 +36,32 @@ class ChatController:
         """
         # Format and add system prompt
         current_date = datetime.datetime.now().strftime('%A, %B %d, %Y')
-        formatted_prompt = prompt.format(current_date=current_date)
+        formatted_prompt = render_prompt_cached(prompt, current_date=current_date)
         self.llm.add_message("system", formatted_prompt)
     
+    def add_static_system_prompt(self, prompt):
+        """
+        Add the immutable system prompt prefix verbatim
+        
+        Keeping this message byte-identical across sessions lets the provider
+        reuse its prompt cache for the whole prefix.
+        
+        Args:
+            prompt: The static system prompt text
+        """
+        self.llm.add_message("system", prompt)
+    
+    def add_dynamic_context(self, template, **context_vars):
+        """
+        Add the volatile part of the system prompt after the static prefix
+        
+        Args:
+            template: Template for the dynamic context
+            **context_vars: Values for the template fields (current_date is filled in if missing)
+        """
+        context_vars.setdefault("current_date", datetime.datetime.now().strftime('%A, %B %d, %Y'))
+        self.llm.add_message("system", render_prompt_cached(template, **context_vars))
+    
     def process_message(self, user_message):
         """
         Process a user message and generate a response with support for function calls
@@ -36,7 +70,7 @@ class ChatController:
             user_message: Text message from the user
                 
         Returns:
-            Response object containing the assistant's message
+            LLMResponse containing the assistant's message
         """
         # Add user message to conversation
         self.llm.add_message("user", user_message)
@@ -44,17 +78,65 @@ class ChatController:
         # Use non-streaming approach with tool calling
         return self._process_message_with_tools(user_message)
     
+    def stream_message(self, user_message):
+        """
+        Process a user message without tools, streaming the response
+        
+        Args:
+            user_message: Text message from the user
+                
+        Yields:
+            Chunks of the assistant's response text as they arrive
+        """
+        self.llm.add_message("user", user_message)
+        
+        chunks = []
+        for chunk in self.llm.stream_completion():
+            chunks.append(chunk)
+            yield chunk
+        
+        # Add the complete response once streaming has finished
+        content = "".join(chunks)
+        self.llm.add_message("assistant", content)
+        
+        # Trigger response complete callback
+        callbacks.trigger(
+            Events.RESPONSE_COMPLETE,
+            content=content
+        )
+    
     def _process_message_with_tools(self, user_message):
         """Process a user message using a simple, reliable tool calling approach."""
         # Loop for tool calling (with reasonable limit to prevent infinite loops)
         max_tool_rounds = 5
+        tools = self.tool_manager.tools
         
         for round_num in range(max_tool_rounds):
+            # Only the first round ends with the user turn, so only it can match semantically
+            query = user_message if round_num == 0 else None
+            
+            # Check the response cache before calling the LLM; semantic matches are
+            # limited to the same conversation before the user turn
+            response = None
+            cache_key = None
+            context_key = None
+            if response_cache is not None:
+                messages = self.llm.messages
+                cache_key = response_cache.hash_messages(messages)
+                if query is not None:
+                    context_key = response_cache.hash_messages(messages[:-1])
+                response = response_cache.get(cache_key, query=query, context_hash=context_key)
+            
             # Get LLM response
-            response = self.llm.get_completion(tools=self.tool_manager.tools)
+            if response is None:
+                response = self.llm.get_completion(tools=tools)
             
             # Handle any tool calls
-            if not hasattr(response, 'tool_calls') or not response.tool_calls:
+            if not response.tool_calls:
+                # Cache successful tool-free responses
+                if cache_key is not None and response.error is None:
+                    response_cache.put(cache_key, response, query=query, context_hash=context_key)
+                
                 # No tool calls, add response and return
                 self.llm.add_message("assistant", response.content)
                 
@@ -80,7 +162,7 @@ class ChatController:
             self.llm.add_message("assistant", response.content, tool_calls=tool_calls_data)
             
             # Execute tools and add responses
-            tool_messages = self.tool_manager.handle_tool_calls(response.tool_calls)
+            tool_messages = self._execute_tool_calls(response.tool_calls)
             
             # Add tool messages to conversation
             for msg in tool_messages:
@@ -98,6 +180,47 @@ class ChatController:
         
         return final_response
     
+    def _execute_tool_calls(self, tool_calls):
+        """Execute the tool calls of one response, concurrently when there are several."""
+        if len(tool_calls) == 1 or not CHAT_PROVIDER.get("parallel_tool_calls", True):
+            return self.tool_manager.handle_tool_calls(tool_calls)
+        
+        # Fan out identical calls once, then collect results in the original order.
+        # Delegations run one after another on this thread: each agent is a single
+        # shared instance whose conversation cannot take two turns at once.
+        keys = []
+        futures_by_key = {}
+        delegations = {}
+        for index, tool_call in enumerate(tool_calls):
+            call_id, key = self.tool_manager.sibling_key(tool_call, index)
+            keys.append((call_id, key))
+            if key in futures_by_key or key in delegations:
+                continue
+            if key[0] == "delegate_agent":
+                delegations[key] = (tool_call, index)
+            else:
+                # Run in a copy of this context so the tool's progress joins the turn's log
+                futures_by_key[key] = _tool_pool.submit(
+                    contextvars.copy_context().run, self.tool_manager.execute_single, tool_call, index
+                )
+        
+        for key, (tool_call, index) in delegations.items():
+            future = futures_by_key[key] = Future()
+            try:
+                future.set_result(self.tool_manager.execute_single(tool_call, index))
+            except Exception as e:
+                future.set_exception(e)
+        
+        tool_messages = []
+        for tool_call, (call_id, key) in zip(tool_calls, keys):
+            try:
+                tool_messages.append({"tool_call_id": call_id, "content": futures_by_key[key].result()["content"]})
+            except Exception as e:
+                # Isolate failures so one broken call does not lose the others' results
+                tool_messages.append(self.tool_manager.format_tool_call_error(tool_call, e))
+        
+        return tool_messages
+    
     @property
     def total_tokens_used(self):
         """Get the total tokens used in this conversation."""
@@ -110,14 +233,8 @@ class ChatController:
         
     def clear_conversation(self):
         """Clear the conversation history but keep the system prompt."""
-        system_message = None
-        if self.llm.messages and self.llm.messages[0]["role"] == "system":
-            system_message = self.llm.messages[0]
-        
-        # Reset messages and add back system message if it existed
-        self.llm.messages = []
-        if system_message:
-            self.llm.messages.append(system_message)
+        # The system prompt messages are pinned in the client
+        self.llm.clear_history()
             
         # Reset token tracking
         self.llm.total_tokens = 0
@@ -24,7 +24,8 @@ VIEWPORT_HEIGHT = 1080
 
 # UI and display settings
 UI_SETTINGS = {
-    "show_tool_reports": True      # Whether to show tool reports after responses
+    "show_tool_reports": True,     # Whether to show tool reports after responses
+    "log_level": "WARNING"         # Level of tool log messages; DEBUG shows extraction progress
 }
 
 # LLM Provider configurations
@@ -50,17 +51,33 @@ OPENROUTER_PROVIDER = {
     "parallel_tool_calls": True
 }
 
+# Response cache settings
+RESPONSE_CACHE = {
+    "enabled": False,                       # Reuse LLM responses for repeated conversations
+    "max_entries": 256,
+    "semantic": False,                      # Also match similar user questions (requires sentence-transformers)
+    "similarity_threshold": 0.95,
+    "embedding_model": "all-MiniLM-L6-v2"
+}
+
 # System settings
 CHAT_PROVIDER = LOCAL_PROVIDER  # Set this to your desired provider
 
 # Tool settings
 TOOL_SETTINGS = {
+    "max_concurrency": 8,          # Max tool calls from one response executed in parallel
+    "cache_enabled": False,        # Cache search and page reads in ~/.cache/agentic_assistant
+    "thread_safe": True,           # Lock tool call records; only disable with parallel_tool_calls off and no agents
     "web_search": {
         "max_results": SEARCH_RESULTS_COUNT,
         "search_depth": 1
     },
     "webpage_reader": {
         "timeout": BROWSER_TIMEOUT // 1000,
-        "max_length": 8000
+        "max_length": 8000,
+        "workers": 2,               # Browser workers kept running between page reads
+        "strict_isolation": False,  # Run workers as processes that can be killed when a page hangs
+        "nice": 5,                  # Niceness added to worker processes (strict_isolation only)
+        "cpu_affinity": None        # CPU ids worker processes are pinned to, e.g. [6, 7] (strict_isolation only)
     }
 }
\ No newline at end of file
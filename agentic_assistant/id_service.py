@@ -1,91 +1,260 @@
 # id_service.py
 """Thread-safe service for generating unique IDs across agents and tools."""
 
+import contextlib
 import threading
-import uuid
 import time
 
+from agentic_assistant.config import TOOL_SETTINGS
+
+# Number of independently locked partitions of the call records
+_SHARD_BITS = 4
+_SHARD_COUNT = 1 << _SHARD_BITS
+
+# Fibonacci hashing spreads IDs over the shards; their low bits are mostly a zero sequence
+_FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+_WORD_MASK = (1 << 64) - 1
+
+# Snowflake-style ID layout: [41 bits milliseconds | 10 bits thread tag | 13 bits sequence]
+_THREAD_BITS = 10
+_SEQUENCE_BITS = 13
+_THREAD_MASK = (1 << _THREAD_BITS) - 1
+_SEQUENCE_MASK = (1 << _SEQUENCE_BITS) - 1
+
+# Tag shared, under a lock, by threads started while all other tags are in use
+_SHARED_TAG = _THREAD_MASK
+
+# Shared args of calls recorded without arguments; never mutated
+_EMPTY_ARGS = {}
+
+# Milliseconds are counted from 2024-01-01 so the timestamp fits 41 bits for decades
+_EPOCH_MS = 1704067200000
+
+class CallRecord:
+    """Metadata of one tool call; instances are recycled by IdService."""
+    
+    __slots__ = ("id", "tool_name", "args", "parent_id", "depth", "start_ns",
+                 "duration_ns", "status", "result_summary")
+    
+    def reset(self, call_id, tool_name, args, parent_id, depth):
+        """Fill the record for a new call."""
+        self.id = call_id
+        self.tool_name = tool_name
+        self.args = args
+        self.parent_id = parent_id
+        self.depth = depth
+        # Monotonic nanoseconds, converted to seconds only for display
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = 0
+        self.status = "running"
+        self.result_summary = "No status available"
+        return self
+    
+    def snapshot(self):
+        """Copy the record; copies are handed out because pooled records get recycled."""
+        copy = CallRecord()
+        for name in CallRecord.__slots__:
+            setattr(copy, name, getattr(self, name))
+        return copy
+
+
+class _ThreadTag:
+    """ID generation state of one thread; the tag is returned for reuse when the thread ends."""
+    
+    __slots__ = ("tag", "last_ms", "sequence", "_free_tags")
+    
+    def __init__(self, tag, last_ms, sequence, free_tags):
+        """Take over a tag together with the last millisecond and sequence it was used at."""
+        self.tag = tag
+        self.last_ms = last_ms
+        self.sequence = sequence
+        self._free_tags = free_tags
+    
+    def __del__(self):
+        # Thread-local values are dropped when their thread exits. The next owner
+        # continues from this state, so it cannot repeat an ID in the same millisecond.
+        if self._free_tags is not None:
+            self._free_tags.append((self.tag, self.last_ms, self.sequence))
+
+
 class IdService:
     """Thread-safe service for generating unique IDs and tracking relationships."""
     
     _instance = None
-    _lock = threading.Lock()
     
     def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(IdService, cls).__new__(cls)
-                cls._instance._counter = 0
-                cls._instance._parent_child_map = {}
-                cls._instance._call_records = {}
+        # The module-level id_service is created at import time, so no lock is needed here
+        if cls._instance is None:
+            cls._instance = super(IdService, cls).__new__(cls)
         return cls._instance
     
+    def __init__(self):
+        """Initialize the service state, once for the shared instance."""
+        if hasattr(self, "_shards"):
+            return
+        
+        # Each thread takes a tag once and numbers its IDs locally without locking;
+        # tags of finished threads are reused, so long sessions never run out
+        self._tls = threading.local()
+        self._tag_lock = threading.Lock()
+        self._next_tag = 0
+        self._free_tags = []
+        self._shared_tag = _ThreadTag(_SHARED_TAG, 0, 0, None)
+        self._shared_tag_lock = threading.Lock()
+        # Single-threaded setups can skip locking entirely
+        if TOOL_SETTINGS.get("thread_safe", True):
+            self._shard_locks = [threading.Lock() for _ in range(_SHARD_COUNT)]
+        else:
+            self._shard_locks = [contextlib.nullcontext() for _ in range(_SHARD_COUNT)]
+        self._shards = [{} for _ in range(_SHARD_COUNT)]
+        self._child_shards = [{} for _ in range(_SHARD_COUNT)]
+        # IDs of calls without a parent, in start order
+        self._top_level_ids = []
+        # Records released by clear_history, reused by record_call_start
+        self._record_pool = []
+    
+    def _shard_index(self, call_id):
+        """Get the shard holding a call ID."""
+        if isinstance(call_id, int):
+            return ((call_id * _FIBONACCI_MULTIPLIER) & _WORD_MASK) >> (64 - _SHARD_BITS)
+        # Provider-assigned string IDs
+        return hash(call_id) % _SHARD_COUNT
+    
+    def _take_tag(self):
+        """Get a free thread tag, or None when all of them belong to running threads."""
+        with self._tag_lock:
+            if self._free_tags:
+                return _ThreadTag(*self._free_tags.pop(), self._free_tags)
+            if self._next_tag < _SHARED_TAG:
+                self._next_tag += 1
+                return _ThreadTag(self._next_tag - 1, 0, 0, self._free_tags)
+        return None
+    
+    @staticmethod
+    def _next_id(state):
+        """Build the next ID of a thread tag."""
+        # Never step back if the wall clock does
+        ms = max(time.time_ns() // 1_000_000 - _EPOCH_MS, state.last_ms)
+        if ms == state.last_ms:
+            state.sequence = (state.sequence + 1) & _SEQUENCE_MASK
+            if state.sequence == 0:
+                # Sequence exhausted for this millisecond, wait for the next one
+                while ms <= state.last_ms:
+                    ms = time.time_ns() // 1_000_000 - _EPOCH_MS
+        else:
+            state.sequence = 0
+        state.last_ms = ms
+        
+        return (ms << (_THREAD_BITS + _SEQUENCE_BITS)) | (state.tag << _SEQUENCE_BITS) | state.sequence
+    
     def generate_id(self, prefix="call"):
-        """Generate a unique ID with optional prefix."""
-        with self._lock:
-            self._counter += 1
-            # Combine timestamp, counter and random bits for uniqueness
-            return f"{prefix}_{int(time.time() * 1000)}_{self._counter}_{uuid.uuid4().hex[:6]}"
+        """
+        Generate a unique integer ID.
+        
+        The prefix is not encoded in the ID; the tool name is kept in the call
+        record and only combined with the ID for display, see format_id.
+        """
+        state = getattr(self._tls, "state", None)
+        if state is None:
+            state = self._tls.state = self._take_tag() or self._shared_tag
+        
+        if state is self._shared_tag:
+            with self._shared_tag_lock:
+                return self._next_id(state)
+        return self._next_id(state)
+    
+    @staticmethod
+    def format_id(call_id, prefix="call"):
+        """Format an ID for display."""
+        if isinstance(call_id, int):
+            return f"{prefix}_{call_id:x}"
+        return str(call_id)
+    
+    def _new_record(self):
+        """Take a record from the pool, or create one."""
+        try:
+            return self._record_pool.pop()
+        except IndexError:
+            return CallRecord()
     
     def record_call_start(self, call_id, tool_name, args=None, parent_id=None, depth=0):
         """Record the start of a tool call."""
-        with self._lock:
-            # Record call metadata
-            self._call_records[call_id] = {
-                "id": call_id,
-                "tool_name": tool_name,
-                "args": args or {},
-                "parent_id": parent_id,
-                "depth": depth,
-                "start_time": time.time(),
-                "status": "running"
-            }
-            
-            # Record parent-child relationship
-            if parent_id:
-                if parent_id not in self._parent_child_map:
-                    self._parent_child_map[parent_id] = []
-                self._parent_child_map[parent_id].append(call_id)
+        # Record call metadata
+        index = self._shard_index(call_id)
+        with self._shard_locks[index]:
+            self._shards[index][call_id] = self._new_record().reset(
+                call_id, tool_name, args if args is not None else _EMPTY_ARGS, parent_id, depth
+            )
+        
+        # Record parent-child relationship, in the parent's shard
+        if parent_id is None:
+            self._top_level_ids.append(call_id)
+        elif parent_id:
+            index = self._shard_index(parent_id)
+            with self._shard_locks[index]:
+                self._child_shards[index].setdefault(parent_id, []).append(call_id)
     
     def record_call_end(self, call_id, result=None, status="success", summary=None):
         """Record the successful completion of a call."""
-        with self._lock:
-            if call_id in self._call_records:
-                self._call_records[call_id]["end_time"] = time.time()
-                self._call_records[call_id]["duration"] = (
-                    self._call_records[call_id]["end_time"] - 
-                    self._call_records[call_id]["start_time"]
-                )
-                self._call_records[call_id]["status"] = status
-                self._call_records[call_id]["result_summary"] = summary or "Completed"
+        self._finish_call(call_id, status, summary or "Completed")
     
     def record_call_error(self, call_id, error="Unknown error"):
         """Record an error in a call."""
-        with self._lock:
-            if call_id in self._call_records:
-                self._call_records[call_id]["end_time"] = time.time()
-                self._call_records[call_id]["duration"] = (
-                    self._call_records[call_id]["end_time"] - 
-                    self._call_records[call_id]["start_time"]
-                )
-                self._call_records[call_id]["status"] = "error"
-                self._call_records[call_id]["result_summary"] = str(error)
+        self._finish_call(call_id, "error", str(error))
+    
+    def _finish_call(self, call_id, status, summary):
+        """Store the outcome of a call, looking its record up once."""
+        end_ns = time.perf_counter_ns()
+        index = self._shard_index(call_id)
+        with self._shard_locks[index]:
+            record = self._shards[index].get(call_id)
+            if record is None:
+                return
+            record.duration_ns = end_ns - record.start_ns
+            record.status = status
+            record.result_summary = summary
     
     def get_all_records(self):
-        """Get all call records."""
-        with self._lock:
-            return list(self._call_records.values())
+        """Get copies of all call records, in the order the calls started."""
+        records = []
+        for lock, shard in zip(self._shard_locks, self._shards):
+            with lock:
+                records.extend(record.snapshot() for record in shard.values())
+        records.sort(key=lambda record: record.start_ns)
+        return records
+    
+    def get_records_by_id(self):
+        """Get copies of all call records indexed by call ID."""
+        records_by_id = {}
+        for lock, shard in zip(self._shard_locks, self._shards):
+            with lock:
+                records_by_id.update((call_id, record.snapshot()) for call_id, record in shard.items())
+        return records_by_id
+    
+    def get_top_level_ids(self):
+        """Get the IDs of calls without a parent, in the order they started."""
+        return list(self._top_level_ids)
     
     def get_parent_child_map(self):
         """Get the parent-child relationship map."""
-        with self._lock:
-            return self._parent_child_map.copy()
+        parent_child_map = {}
+        for lock, shard in zip(self._shard_locks, self._child_shards):
+            with lock:
+                parent_child_map.update(shard)
+        return parent_child_map
     
     def clear_history(self):
-        """Clear history but keep the counter."""
-        with self._lock:
-            self._parent_child_map = {}
-            self._call_records = {}
+        """Clear history but keep the counter, returning the records to the pool."""
+        self._top_level_ids = []
+        for index, lock in enumerate(self._shard_locks):
+            with lock:
+                self._record_pool.extend(self._shards[index].values())
+                self._shards[index] = {}
+                self._child_shards[index] = {}
+        
+        # Do not keep tool arguments alive through the pool
+        for record in self._record_pool:
+            record.args = None
 
 # Global instance
 id_service = IdService()
@@ -1,18 +1,146 @@
 # llm_client.py
 """Client for interacting with language model providers."""
 
+import threading
+from collections import deque
+
 from agentic_assistant.config import CHAT_PROVIDER
 from agentic_assistant.callbacks import callbacks, Events
+from agentic_assistant import serialization
+
+# Fraction of the context window the history may fill before old turns are dropped
+HISTORY_BUDGET = 0.8
+
+# OpenAI client shared by every LLMClient, so its connection pool is reused
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """Get the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                
+                # Create client with provider-specific parameters
+                _client = OpenAI(
+                    base_url=CHAT_PROVIDER.get("api_url"),
+                    api_key=CHAT_PROVIDER.get("api_key")
+                )
+    return _client
+
+
+class LLMResponse:
+    """Normalized LLM response, so callers read attributes directly instead of probing them."""
+    
+    __slots__ = ("content", "tool_calls", "error")
+    
+    def __init__(self, content="", tool_calls=(), error=None):
+        """Initialize the response with empty defaults."""
+        self.content = content
+        self.tool_calls = tool_calls
+        self.error = error
+
+
+def parse_json_response(text):
+    """
+    Parse JSON requested from the model, tolerating code fences and surrounding prose.
+    
+    Args:
+        text: The response text
+        
+    Returns:
+        The parsed object, or None if no JSON could be parsed
+    """
+    if not text:
+        return None
+    
+    # Take the outermost array or object, skipping any prose or ``` fences around it
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end = text.rfind("]" if text[start] == "[" else "}")
+    if end < start:
+        return None
+    
+    try:
+        return serialization.loads(text[start:end + 1])
+    except serialization.JSONDecodeError:
+        return None
+
 
 class LLMClient:
     """Client for language model interactions."""
 
     def __init__(self):
         """Initialize the LLM client."""
-        self.messages = []
+        # Leading system messages stay pinned; the rest is a sliding window of
+        # (message, estimated tokens) pairs
+        self._system_messages = []
+        self._history = deque()
+        self._history_tokens = 0
+        self._system_tokens = 0
         self.total_tokens = 0
         self.context_size = CHAT_PROVIDER.get("context_size", 16384)
     
+    @property
+    def messages(self):
+        """The conversation sent to the model: pinned system messages followed by the history."""
+        return self._system_messages + [message for message, _ in self._history]
+    
+    @messages.setter
+    def messages(self, messages):
+        """Replace the conversation, pinning its leading system messages."""
+        self._system_messages = []
+        self._history = deque()
+        self._history_tokens = 0
+        self._system_tokens = 0
+        for message in messages:
+            self._append(message)
+        self._evict_old_turns()
+    
+    def clear_history(self):
+        """Drop every message except the pinned system messages."""
+        self._history.clear()
+        self._history_tokens = 0
+    
+    @staticmethod
+    def _estimate_tokens(message):
+        """Roughly estimate the tokens of a message (about 4 characters per token)."""
+        size = len(message.get("content") or "")
+        if message.get("tool_calls"):
+            size += len(serialization.dumps(message["tool_calls"], default=str))
+        return size // 4
+    
+    def _append(self, message):
+        """Append a message, pinning system messages that precede the history."""
+        tokens = self._estimate_tokens(message)
+        if message["role"] == "system" and not self._history:
+            self._system_messages.append(message)
+            self._system_tokens += tokens
+        else:
+            self._history.append((message, tokens))
+            self._history_tokens += tokens
+    
+    def _evict_old_turns(self):
+        """Drop the oldest turns while the estimated context exceeds the history budget."""
+        budget = self.context_size * HISTORY_BUDGET
+        while self._system_tokens + self._history_tokens > budget:
+            # Find where the next turn starts, so tool results are never orphaned
+            next_turn = next(
+                (i for i, (message, _) in enumerate(self._history) if i > 0 and message["role"] == "user"),
+                None
+            )
+            if next_turn is None:
+                break  # Never drop the current turn
+            
+            for _ in range(next_turn):
+                _, tokens = self._history.popleft()
+                self._history_tokens -= tokens
+    
     def add_message(self, role, content, **kwargs):
         """
         Add a message to the conversation history.
@@ -27,7 +155,8 @@ class LLMClient:
         """
         message = {"role": role, "content": content}
         message.update(kwargs)
-        self.messages.append(message)
+        self._append(message)
+        self._evict_old_turns()
         return message
     
     def get_completion(self, tools=None):
@@ -38,16 +167,10 @@ class LLMClient:
             tools: Optional list of tool schemas
             
         Returns:
-            The LLM's response message
+            LLMResponse with the message content and tool calls
         """
         try:
-            from openai import OpenAI
-            
-            # Create client with provider-specific parameters
-            client = OpenAI(
-                base_url=CHAT_PROVIDER.get("api_url"),
-                api_key=CHAT_PROVIDER.get("api_key")
-            )
+            client = get_openai_client()
             
             # Make API call
             response = client.chat.completions.create(
@@ -71,15 +194,42 @@ class LLMClient:
                     completion_tokens=response.usage.completion_tokens
                 )
             
-            return response.choices[0].message
+            message = response.choices[0].message
+            return LLMResponse(
+                content=message.content or "",
+                tool_calls=tuple(message.tool_calls or ())
+            )
             
         except Exception as e:
             print(f"Error calling LLM: {str(e)}")
+            return LLMResponse(content=f"Error: {str(e)}", error=str(e))
+    
+    def stream_completion(self):
+        """
+        Stream a completion from the language model, without tools.
+        
+        Yields:
+            Chunks of the response text as they arrive
+        """
+        try:
+            client = get_openai_client()
             
-            # Simple error response
-            class ErrorResponse:
-                def __init__(self, error):
-                    self.content = f"Error: {error}"
-                    self.tool_calls = []
+            # Make streaming API call
+            stream = client.chat.completions.create(
+                model=CHAT_PROVIDER.get("model"),
+                messages=self.messages,
+                temperature=CHAT_PROVIDER.get("temperature"),
+                timeout=CHAT_PROVIDER.get("timeout", 120),
+                stream=True
+            )
             
-            return ErrorResponse(str(e))
+            for chunk in stream:
+                # Track tokens if the provider reports usage on the stream
+                if getattr(chunk, 'usage', None):
+                    self.total_tokens += chunk.usage.total_tokens
+                
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                    
+        except Exception as e:
+            print(f"Error calling LLM: {str(e)}")
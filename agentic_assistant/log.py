@@ -0,0 +1,65 @@
+# log.py
+"""
+Buffered progress output.
+Messages logged during a turn are collected and written to stdout in one go
+when the turn ends, instead of one print per message from every worker thread.
+"""
+
+import sys
+import threading
+from contextvars import ContextVar
+from typing import List, Optional
+
+# Logger of the turn running in the current context. Each thread and task has its own
+# context, so concurrent turns do not share a buffer; worker threads joining a turn
+# must be run with contextvars.copy_context().run to log into it.
+_active_logger: ContextVar[Optional["TurnLogger"]] = ContextVar("active_logger", default=None)
+
+
+class TurnLogger:
+    """Context manager collecting progress messages and flushing them once on exit."""
+
+    def __init__(self, stream=None):
+        """Initialize an empty buffer."""
+        self.stream = stream
+        self._messages: List[str] = []
+        self._lock = threading.Lock()
+        self._token = None
+
+    def __enter__(self):
+        # Nested turns (e.g. a delegated agent) log into the outermost buffer
+        active = _active_logger.get()
+        if active is not None:
+            return active
+        self._token = _active_logger.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._token is not None:
+            _active_logger.reset(self._token)
+            self._token = None
+            self.flush()
+        return False
+
+    def info(self, message: str) -> None:
+        """Buffer a message; tool threads of the turn may call this concurrently."""
+        with self._lock:
+            self._messages.append(message)
+
+    def flush(self) -> None:
+        """Write all buffered messages with a single write."""
+        with self._lock:
+            messages, self._messages = self._messages, []
+        if messages:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(messages) + "\n")
+            stream.flush()
+
+
+def info(message: str) -> None:
+    """Log a progress message, buffered if a turn is in progress and printed otherwise."""
+    active = _active_logger.get()
+    if active is not None:
+        active.info(message)
+    else:
+        print(message)
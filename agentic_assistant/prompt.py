@@ -2,11 +2,18 @@
 """
 System prompt for the Web Assistant.
 Updated to include agent capabilities.
+
+The prompt is split in two parts so that providers can cache the long static
+prefix: SYSTEM_PROMPT_STATIC never changes between sessions, while the volatile
+fields (date, agent list) live in SYSTEM_PROMPT_DYNAMIC_TEMPLATE, sent after it.
 """
 
-SYSTEM_PROMPT = """# Web Assistant
+from functools import lru_cache
+from string import Formatter
+
+SYSTEM_PROMPT_STATIC = """# Web Assistant
 
-You are a helpful web assistant that can search for information and extract content from websites. Current date is : {current_date}.
+You are a helpful web assistant that can search for information and extract content from websites.
 
 ## Capabilities
 - Search the web for current information
@@ -26,9 +33,7 @@ You are a helpful web assistant that can search for information and extract cont
 - When appropriate, use both tools in sequence to research thoroughly
 
 ## Specialized Agents
-You can delegate specific tasks to these specialized agents:
-
-{agent_descriptions}
+You can delegate specific tasks to the specialized agents listed in the session context.
 
 Use the delegate_to_agent tool when a task would benefit from specialized processing. For example:
 - Use query_improver agent to enhance poorly formulated user queries
@@ -45,3 +50,65 @@ Use the delegate_to_agent tool when a task would benefit from specialized proces
 
 Your goal is to provide helpful, accurate information while guiding the conversation in a natural progression.
 """
+
+SYSTEM_PROMPT_DYNAMIC_TEMPLATE = """# Session Context
+
+Current date is : {current_date}.
+
+## Available Specialized Agents
+{agent_descriptions}
+"""
+
+
+@lru_cache(maxsize=None)
+def _parse_template(template):
+    """Split a template once into (literal, field name) pieces, or None if it needs str.format."""
+    pieces = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if format_spec or conversion or (field_name is not None and not field_name.isidentifier()):
+            return None  # Let str.format handle specs, conversions and attribute access
+        pieces.append((literal, field_name))
+    return tuple(pieces)
+
+
+def render_prompt(template, **values):
+    """
+    Fill a prompt template with plain concatenation, parsing each template only once.
+    
+    Args:
+        template: Template using str.format style {field} placeholders
+        **values: Values for the template fields
+        
+    Returns:
+        The rendered prompt
+    """
+    pieces = _parse_template(template)
+    if pieces is None:
+        return template.format(**values)
+    
+    parts = []
+    for literal, field_name in pieces:
+        parts.append(literal)
+        if field_name is not None:
+            parts.append(str(values[field_name]))
+    return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def _render_prompt_items(template, items):
+    """Render a template from a hashable tuple of field items."""
+    return render_prompt(template, **dict(items))
+
+
+def render_prompt_cached(template, **values):
+    """
+    Like render_prompt, but remember the result for recent values.
+    
+    Meant for system prompts, whose fields (date, agent list) change rarely:
+    every controller created on the same day reuses the same rendered string.
+    """
+    try:
+        return _render_prompt_items(template, tuple(sorted(values.items())))
+    except TypeError:
+        # Unhashable values cannot be cached
+        return render_prompt(template, **values)
@@ -0,0 +1,55 @@
+# serialization.py
+"""JSON encoding and decoding for the message path, using orjson when available."""
+
+import json
+from typing import Any
+
+# orjson is a C implementation, several times faster on large payloads
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Raised by loads on invalid input, whichever backend is used
+JSONDecodeError = orjson.JSONDecodeError if ORJSON_AVAILABLE else json.JSONDecodeError
+
+
+def dumps(obj: Any, sort_keys: bool = False, default=None) -> str:
+    """
+    Serialize an object to compact JSON text.
+
+    Args:
+        obj: The object to serialize
+        sort_keys: Whether to sort dictionary keys, for stable hashing
+        default: Fallback for objects that are not natively serializable
+
+    Returns:
+        The JSON text
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode()
+        except TypeError:
+            # orjson rejects some inputs json accepts (e.g. integers over 64 bits)
+            pass
+
+    return json.dumps(obj, sort_keys=sort_keys, default=default, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(text) -> Any:
+    """
+    Parse JSON text.
+
+    Args:
+        text: JSON as str or bytes
+
+    Returns:
+        The parsed object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
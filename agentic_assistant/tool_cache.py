@@ -0,0 +1,103 @@
+# tool_cache.py
+"""Persistent disk cache for deterministic tool results (searches, page reads)."""
+
+import hashlib
+import inspect
+import logging
+import os
+import tempfile
+import time
+from functools import wraps
+
+from agentic_assistant.config import TOOL_SETTINGS
+from agentic_assistant import serialization
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agentic_assistant")
+
+
+def _cache_dir():
+    """Get the cache directory from config."""
+    return os.path.expanduser(TOOL_SETTINGS.get("cache_dir", DEFAULT_CACHE_DIR))
+
+
+def _read_entry(path, ttl):
+    """Load a cache entry, or None if it is missing, unreadable or expired."""
+    try:
+        with open(path, "rb") as f:
+            entry = serialization.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+    if ttl is not None and time.time() - entry.get("created", 0) > ttl:
+        return None
+    return entry
+
+
+def _write_entry(path, result):
+    """Store a cache entry atomically so concurrent readers never see a partial file."""
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(serialization.dumps({"created": time.time(), "result": result}, default=str).encode())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write tool cache entry: %s", e)
+
+
+def memoize_tool(ttl=3600, name=None):
+    """
+    Decorator caching a tool's results on disk, keyed by its arguments.
+
+    Only enabled when TOOL_SETTINGS["cache_enabled"] is set. Results reporting an
+    error are not cached, and arguments starting with an underscore (tracking
+    information) are left out of the key.
+
+    Args:
+        ttl: Seconds a cached result stays valid, None to keep it forever
+        name: Cache namespace, defaults to the function's module and name
+
+    Returns:
+        Decorator function
+    """
+    def decorator(func):
+        namespace = name or f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TOOL_SETTINGS.get("cache_enabled", False):
+                return func(*args, **kwargs)
+
+            # Key on the full set of arguments, defaults included
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {}
+            for key, value in bound.arguments.items():
+                if signature.parameters[key].kind is inspect.Parameter.VAR_KEYWORD:
+                    arguments.update(value)
+                else:
+                    arguments[key] = value
+            arguments = {key: value for key, value in arguments.items() if not key.startswith("_")}
+            payload = serialization.dumps([namespace, arguments], sort_keys=True, default=str).encode()
+            path = os.path.join(_cache_dir(), hashlib.blake2b(payload, digest_size=16).hexdigest() + ".json")
+
+            # If the result is cached, return it; otherwise run the tool and save it
+            entry = _read_entry(path, ttl)
+            if entry is not None:
+                result = entry["result"]
+                if isinstance(result, dict) and "_tool_status" in result:
+                    result["_tool_status"] += " (cached)"
+                return result
+
+            result = func(*args, **kwargs)
+            if not (isinstance(result, dict) and "error" in result):
+                _write_entry(path, result)
+            return result
+
+        return wrapper
+
+    return decorator
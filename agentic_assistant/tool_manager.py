@@ -1,12 +1,38 @@
 # tool_manager.py
 """Improved tool manager that uses atomic ID tracking with better error handling."""
 
-import json
-import time
+import asyncio
+import contextvars
 from typing import Dict, List, Any, Optional, Set
 from colorama import Fore, Style
 
 from agentic_assistant.id_service import id_service
+from agentic_assistant.callbacks import callbacks, Events
+from agentic_assistant import log, serialization
+
+# Report line pieces per call status: (emoji, color, reset), colored and plain
+_REPORT_STYLES = {
+    True: {
+        "success": ("✅", Fore.GREEN, Style.RESET_ALL),
+        "error": ("❌", Fore.RED, Style.RESET_ALL),
+        None: ("⚠️", Fore.YELLOW, Style.RESET_ALL),
+    },
+    False: {
+        "success": ("✅", "", ""),
+        "error": ("❌", "", ""),
+        None: ("⚠️", "", ""),
+    },
+}
+
+# Indentation strings by level, extended on demand for deeper trees
+_INDENTS = ["  " * level for level in range(16)]
+
+
+def _indent(level):
+    """Get the indentation string for a report level."""
+    while level >= len(_INDENTS):
+        _INDENTS.append("  " * len(_INDENTS))
+    return _INDENTS[level]
 
 
 class ToolManager:
@@ -15,11 +41,16 @@ class ToolManager:
     def __init__(self):
         """Initialize the tool manager."""
         # Import here to avoid circular imports
-        from agentic_assistant.tools.registry import get_tool_function, get_all_schemas
+        from agentic_assistant.tools.registry import get_tool_function, get_all_schemas, get_registry_version
         
         # Tool registry access
         self.get_tool = get_tool_function
         self.get_schemas = get_all_schemas
+        self.get_registry_version = get_registry_version
+        
+        # Schemas built once per registry version
+        self._tools_cache: Optional[List[Dict[str, Any]]] = None
+        self._tools_version = None
     
     def execute_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
         """Execute a tool by name with arguments and track using atomic IDs."""
@@ -29,23 +60,25 @@ class ToolManager:
         
         if isinstance(tool_args, dict):
             # Extract and remove tracking information from arguments
-            parent_id = tool_args.pop('_parent_call_id', None) if '_parent_call_id' in tool_args else None
-            current_depth = tool_args.pop('_depth', 0) if '_depth' in tool_args else 0
+            parent_id = tool_args.pop('_parent_call_id', None)
+            current_depth = tool_args.pop('_depth', 0)
         
         # Generate unique ID for this call
         call_id = id_service.generate_id(prefix=tool_name)
         
+        # Delegation adds tracking arguments below; record a copy so the report shows only the task
+        is_delegation = tool_name == "delegate_agent"
+        recorded_args = dict(tool_args) if is_delegation and isinstance(tool_args, dict) else tool_args
+        
         # Record the start of the call
         id_service.record_call_start(
             call_id=call_id,
             tool_name=tool_name,
-            args=tool_args,
+            args=recorded_args,
             parent_id=parent_id,
             depth=current_depth
         )
         
-        start_time = time.time()
-        
         try:
             # Get and execute the tool
             tool_func = self.get_tool(tool_name)
@@ -56,12 +89,11 @@ class ToolManager:
                 return self._format_error(tool_name, error_msg)
             
             # Special handling for agent delegation - standardized to only use delegate_agent name
-            is_delegation = tool_name == "delegate_agent"
             if is_delegation and isinstance(tool_args, dict):
                 agent_name = tool_args.get('agent_name', 'unknown')
                 task = tool_args.get('task', 'unspecified task')
                 task_preview = task[:50] + "..." if len(task) > 50 else task
-                print(f"\n[Delegating to {agent_name} agent: \"{task_preview}\"]")
+                log.info(f"\n[Delegating to {agent_name} agent: \"{task_preview}\"]")
                 
                 # Pass the call_id as parent_id to the agent
                 tool_args['_parent_call_id'] = call_id
@@ -70,13 +102,9 @@ class ToolManager:
             # Execute the tool
             result = tool_func(**tool_args)
             
-            # Calculate duration
-            duration = time.time() - start_time
-            
             # Extract status message if provided
-            status = f"✓ {tool_name}: Completed successfully"
-            if isinstance(result, dict) and "_tool_status" in result:
-                status = result.pop("_tool_status")
+            status = result.pop("_tool_status", None) if isinstance(result, dict) else None
+            status = status or f"✓ {tool_name}: Completed successfully"
             
             # Record the successful completion
             id_service.record_call_end(
@@ -87,7 +115,6 @@ class ToolManager:
             )
             
             # Trigger tool end event for tracking
-            from agentic_assistant.callbacks import callbacks, Events
             callbacks.trigger(
                 Events.TOOL_END,
                 tool_name=tool_name,
@@ -98,9 +125,6 @@ class ToolManager:
             return result
             
         except Exception as e:
-            # Calculate duration
-            duration = time.time() - start_time
-            
             # Record the error
             id_service.record_call_error(
                 call_id=call_id,
@@ -108,7 +132,6 @@ class ToolManager:
             )
             
             # Trigger tool end event even for errors
-            from agentic_assistant.callbacks import callbacks, Events
             callbacks.trigger(
                 Events.TOOL_END,
                 tool_name=tool_name,
@@ -118,6 +141,19 @@ class ToolManager:
             
             return self._format_error(tool_name, str(e))
     
+    async def execute_tool_async(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        """
+        Execute a tool without blocking the event loop.
+
+        Tools are blocking functions (requests, Playwright), so the call runs in
+        the default executor, in a copy of the current context so progress messages
+        reach the turn's log; several of these can be awaited with asyncio.gather.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, contextvars.copy_context().run, self.execute_tool, tool_name, tool_args
+        )
+
     def _format_error(self, tool_name: str, error_msg: str) -> Dict[str, str]:
         """Format error responses consistently."""
         return {
@@ -126,183 +162,186 @@ class ToolManager:
         }
     
     def handle_tool_calls(self, tool_calls: List) -> List[Dict[str, str]]:
-        """Process multiple tool calls from the LLM."""
-        results = []
+        """Process multiple tool calls from the LLM, running identical siblings once."""
+        tool_messages = []
+        content_by_key = {}
+        for index, tool_call in enumerate(tool_calls):
+            call_id, key = self.sibling_key(tool_call, index)
+            if key in content_by_key:
+                tool_messages.append({"tool_call_id": call_id, "content": content_by_key[key]})
+                continue
+            
+            message = self.execute_single(tool_call, index)
+            content_by_key[key] = message["content"]
+            tool_messages.append(message)
         
-        # Convert tool calls to a standardized format
-        standardized_tool_calls = self._standardize_tool_calls(tool_calls)
+        return tool_messages
+    
+    def sibling_key(self, tool_call: Any, index: int = 0):
+        """
+        Identify a tool call among the calls of one response.
         
-        # Process each tool call
-        for tool_call in standardized_tool_calls:
+        Returns:
+            Tuple of (call id, key), where calls with the same key share one
+            execution and its serialized result
+        """
+        call_id, func_name, arguments = self._unpack_tool_call(tool_call, index)
+        return call_id, (func_name, arguments)
+    
+    def execute_single(self, tool_call: Any, index: int = 0) -> Dict[str, str]:
+        """Process one tool call from the LLM and return its tool message."""
+        try:
+            # Extract function details
+            call_id, func_name, arguments = self._unpack_tool_call(tool_call, index)
+            
             try:
-                # Extract function details
-                call_id = tool_call.get("id", f"call_{len(results)}")
-                func_name = tool_call.get("function", {}).get("name", "unknown_function")
-                
-                try:
-                    arguments = tool_call.get("function", {}).get("arguments", "{}")
-                    func_args = json.loads(arguments)
-                except json.JSONDecodeError:
-                    print(f"\n[Warning: Invalid JSON in arguments for {func_name}]")
-                    func_args = {}
-                
-                # Add tracking information
-                func_args['_parent_call_id'] = call_id
-                func_args['_depth'] = 0  # Top level
-                
-                # Special handling for delegate_agent tool to improve tracking
-                is_agent_delegation = func_name == "delegate_agent"
-                agent_name = None
-                if is_agent_delegation and isinstance(func_args, dict):
-                    agent_name = func_args.get('agent_name', None)
-                    task = func_args.get('task', 'unspecified task')
-                    # Do NOT log delegation here - it will be logged in execute_tool
-                    # This prevents duplicate logging
-                
-                # Execute the tool
-                result = self.execute_tool(func_name, func_args)
-                
-                # Format the result for the response
-                result_str = json.dumps(result) if isinstance(result, (dict, list)) else str(result)
-                
-                # Add to results
-                results.append({
-                    "tool_call_id": call_id,
-                    "content": result_str
-                })
-                
-            except Exception as e:
-                # Add error response
-                call_id = tool_call.get("id", "unknown")
-                error_response = self._format_error("tool_calls", str(e))
-                results.append({
-                    "tool_call_id": call_id,
-                    "content": json.dumps(error_response)
-                })
-        
-        return results
+                func_args = serialization.loads(arguments)
+            except serialization.JSONDecodeError:
+                print(f"\n[Warning: Invalid JSON in arguments for {func_name}]")
+                func_args = {}
+            
+            # Add tracking information
+            func_args['_parent_call_id'] = call_id
+            func_args['_depth'] = 0  # Top level
+            
+            # Delegation is logged in execute_tool; logging it here would duplicate it
+            
+            # Execute the tool
+            result = self.execute_tool(func_name, func_args)
+            
+            # Format the result for the response
+            result_str = serialization.dumps(result) if isinstance(result, (dict, list)) else str(result)
+            
+            return {
+                "tool_call_id": call_id,
+                "content": result_str
+            }
+            
+        except Exception as e:
+            return self.format_tool_call_error(tool_call, e)
+    
+    def format_tool_call_error(self, tool_call: Any, error: Exception) -> Dict[str, str]:
+        """Build the tool message reporting a failed tool call."""
+        if isinstance(tool_call, dict):
+            call_id = tool_call.get("id", "unknown")
+        else:
+            call_id = getattr(tool_call, "id", "unknown")
+        error_response = self._format_error("tool_calls", str(error))
+        return {
+            "tool_call_id": call_id,
+            "content": serialization.dumps(error_response)
+        }
     
-    def _standardize_tool_calls(self, tool_calls):
-        """Convert tool calls to a standard format regardless of input format."""
-        standardized = []
+    def _unpack_tool_call(self, call, index=0):
+        """Get (id, function name, JSON arguments) of a tool call in any supported format."""
+        function = getattr(call, 'function', None)
+        if function is not None:
+            # OpenAI format: read the attributes directly, without building dicts
+            return call.id, function.name, function.arguments
         
-        for call in tool_calls:
-            if hasattr(call, 'function'):
-                # OpenAI format
-                standardized.append({
-                    "id": call.id,
+        function = self._standardize_tool_call(call, index).get("function", {})
+        call_id = call.get("id", f"call_{index}") if isinstance(call, dict) else f"call_{index}"
+        return call_id, function.get("name", "unknown_function"), function.get("arguments", "{}")
+    
+    def _standardize_tool_call(self, call, index=0):
+        """Convert a tool call to a standard format regardless of input format."""
+        if hasattr(call, 'function'):
+            # OpenAI format
+            return {
+                "id": call.id,
+                "type": "function",
+                "function": {
+                    "name": call.function.name,
+                    "arguments": call.function.arguments
+                }
+            }
+        elif isinstance(call, dict):
+            # Dictionary format
+            if "function" in call:
+                return call
+            elif "function" in call.get("function", {}):
+                # Handle nested function format
+                return {
+                    "id": call.get("id", f"call_{index}"),
                     "type": "function",
-                    "function": {
-                        "name": call.function.name,
-                        "arguments": call.function.arguments
-                    }
-                })
-            elif isinstance(call, dict):
-                # Dictionary format
-                if "function" in call:
-                    standardized.append(call)
-                elif "function" in call.get("function", {}):
-                    # Handle nested function format
-                    standardized.append({
-                        "id": call.get("id", f"call_{len(standardized)}"),
-                        "type": "function",
-                        "function": call["function"]
-                    })
-        
-        return standardized
+                    "function": call["function"]
+                }
+        return {}
     
     def get_report(self, colored: bool = True) -> str:
         """Generate a formatted report of tool usage."""
         # Get data from the central ID service
-        records = id_service.get_all_records()
+        records_by_id = id_service.get_records_by_id()
         parent_child_map = id_service.get_parent_child_map()
         
-        if not records:
+        if not records_by_id:
             return "No tools used in this conversation."
         
         lines = ["🔧 Tools used in this conversation:"]
         
-        # Find top-level calls (no parent)
-        top_level_calls = [call for call in records if call.get("parent_id") is None]
-        
-        # Process each top-level call
-        for call in top_level_calls:
-            self._format_call(call, lines, parent_child_map, records, indent=1, colored=colored)
+        # Process each top-level call (no parent)
+        for call_id in id_service.get_top_level_ids():
+            call = records_by_id.get(call_id)
+            if call is not None:
+                self._format_call(call, lines, parent_child_map, records_by_id, indent=1, colored=colored)
         
         return "\n".join(lines)
     
-    def _format_call(self, call, lines, parent_child_map, all_records, indent=0, colored=False, visited=None):
-        """Format a single tool call for the report with cycle detection."""
+    def _format_call(self, call, lines, parent_child_map, records_by_id, indent=0, colored=False, visited=None):
+        """Format a tool call and its descendants for the report, with cycle detection."""
         # Initialize visited set to prevent circular references
         if visited is None:
             visited = set()
-            
-        # Get call_id safely
-        call_id = call.get("id", "unknown")
         
-        # Check for circular references
-        if call_id in visited:
-            indent_str = "  " * indent
-            lines.append(f"{indent_str}⚠️ Circular reference detected for ID: {call_id}")
-            return
-            
-        # Add to visited set
-        visited.add(call_id)
-        
-        indent_str = "  " * indent
-        
-        # Determine status formatting - safely access with .get()
-        status = call.get("status", "unknown")
-        if status == "success":
-            status_emoji = "✅"
-            color = Fore.GREEN if colored else ""
-        elif status == "error":
-            status_emoji = "❌"
-            color = Fore.RED if colored else ""
-        else:
-            status_emoji = "⚠️"
-            color = Fore.YELLOW if colored else ""
+        styles = _REPORT_STYLES[bool(colored)]
         
-        # Format duration safely
-        duration = call.get("duration", 0)
-        
-        # Build the line with safe attribute access
-        tool_name = call.get("tool_name", "unknown")
-        result_summary = call.get("result_summary", "No status available")
-        depth = call.get("depth", 0)
-        depth_indicator = f"[D{depth}]" if depth > 0 else ""
-        
-        # Special formatting for agent delegation
-        is_delegation = tool_name == "delegate_agent"
-        if is_delegation:
-            args = call.get("args", {})
-            agent_name = args.get("agent_name", "unknown")
-            task = args.get("task", "")
+        # Depth-first walk with an explicit stack, so deep delegation chains cannot hit the recursion limit
+        stack = [(call, indent)]
+        while stack:
+            call, indent = stack.pop()
+            call_id = call.id
+            indent_str = _indent(indent)
             
-            # Format as agent call rather than tool call
-            lines.append(f"{indent_str}{status_emoji} {color}Agent: {agent_name}{Style.RESET_ALL if colored else ''} {depth_indicator} ({duration:.2f}s): {result_summary}")
-            if task:
-                lines.append(f"{indent_str}   Task: \"{task}\"")
-        else:
-            # Normal tool call formatting with standardized format
-            lines.append(f"{indent_str}{status_emoji} {color}{tool_name}{Style.RESET_ALL if colored else''} {depth_indicator} ({duration:.2f}s): {result_summary}")
+            # Check for circular references
+            if call_id in visited:
+                lines.append(f"{indent_str}⚠️ Circular reference detected for ID: {id_service.format_id(call_id, call.tool_name)}")
+                continue
+                
+            # Add to visited set
+            visited.add(call_id)
             
-            # Add tool-specific details
-            args = call.get("args", {})
-            if tool_name == "search_web" and "query" in args:
-                lines.append(f"{indent_str}   Query: \"{args['query']}\"")
-            elif tool_name == "webpage_reader" and "url" in args:
-                lines.append(f"{indent_str}   URL: {args['url']}")
-        
-        # Add child calls
-        if call_id in parent_child_map:
-            child_ids = parent_child_map[call_id]
-            for child_id in child_ids:
-                # Find the child call in all records
-                for child_call in all_records:
-                    if child_call.get("id") == child_id:
-                        self._format_call(child_call, lines, parent_child_map, all_records, indent + 1, colored, visited)
-                        break
+            # Determine status formatting
+            status_emoji, color, reset = styles.get(call.status) or styles[None]
+            
+            # Build the line
+            tool_name = call.tool_name
+            depth = call.depth
+            depth_indicator = f"[D{depth}]" if depth > 0 else ""
+            suffix = f" {depth_indicator} ({call.duration_ns / 1e9:.2f}s): {call.result_summary}"
+            args = call.args
+            
+            # Special formatting for agent delegation
+            if tool_name == "delegate_agent":
+                # Format as agent call rather than tool call
+                lines.append("".join((indent_str, status_emoji, " ", color, "Agent: ", str(args.get("agent_name", "unknown")), reset, suffix)))
+                task = args.get("task", "")
+                if task:
+                    lines.append(f"{indent_str}   Task: \"{task}\"")
+            else:
+                # Normal tool call formatting with standardized format
+                lines.append("".join((indent_str, status_emoji, " ", color, tool_name, reset, suffix)))
+                
+                # Add tool-specific details
+                if tool_name == "search_web" and "query" in args:
+                    lines.append(f"{indent_str}   Query: \"{args['query']}\"")
+                elif tool_name == "webpage_reader" and "url" in args:
+                    lines.append(f"{indent_str}   URL: {args['url']}")
+            
+            # Queue child calls, reversed so they are printed in order
+            for child_id in reversed(parent_child_map.get(call_id, ())):
+                child_call = records_by_id.get(child_id)
+                if child_call is not None:
+                    stack.append((child_call, indent + 1))
     
     def reset(self) -> None:
         """Reset the tool manager state for a new conversation turn."""
@@ -315,5 +354,9 @@ class ToolManager:
 
     @property
     def tools(self) -> List[Dict[str, Any]]:
-        """Get all available tool schemas."""
-        return self.get_schemas()
+        """Get all available tool schemas, rebuilt only when the registry changes."""
+        version = self.get_registry_version()
+        if self._tools_cache is None or self._tools_version != version:
+            self._tools_cache = self.get_schemas()
+            self._tools_version = version
+        return self._tools_cache
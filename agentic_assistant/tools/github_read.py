@@ -3,203 +3,454 @@
 
 import requests
 import base64
+import importlib.util
 import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import wraps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from agentic_assistant.tools.registry import tool
+from agentic_assistant import serialization
 from agentic_assistant.config import GITHUB_PAT, GITHUB_RESULTS_LIMIT, HTTP_TIMEOUT, USER_AGENT
 
+# Progress details go to debug logging, formatted only when DEBUG is enabled
+logger = logging.getLogger(__name__)
+
+# urllib3 decodes brotli bodies when a brotli module is installed; only then advertise it
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+
+# --- Shared Session ---
+# One session for all GitHub calls keeps connections alive between requests,
+# so only the first call pays for the TCP and TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], respect_retry_after_header=True)
+))
+_SESSION.headers.update({
+    "Accept": "application/vnd.github.v3+json",
+    "Authorization": f"Bearer {GITHUB_PAT}",
+    "User-Agent": USER_AGENT,
+    # Compressed JSON and text bodies are several times smaller on the wire
+    "Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+})
+
+# --- ETag Cache ---
+# Last ETag and parsed body per request. GitHub answers a matching If-None-Match
+# with an empty 304 that does not count against the rate limit.
+_ETAG_CACHE_SIZE = 512
+_ETAG_CACHE = OrderedDict()
+_ETAG_LOCK = threading.Lock()
+
+# Concurrent file reads for the get_file_contents action
+_FILE_FETCH_WORKERS = 5
+
+# --- GraphQL ---
+# One query for a user's or organization's repositories, selecting only the
+# fields the listing reports; the connection is already sorted and filtered
+_GRAPHQL_URL = "https://api.github.com/graphql"
+_REPOSITORIES_QUERY = """
+query($owner: String!, $first: Int!) {
+  repositoryOwner(login: $owner) {
+    repositories(first: $first, ownerAffiliations: [OWNER], orderBy: {field: UPDATED_AT, direction: DESC}) {
+      totalCount
+      nodes { name nameWithOwner description url stargazerCount isPrivate updatedAt }
+    }
+  }
+}
+"""
+
+# Media type returning file contents as is, without the base64 JSON envelope
+_RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+# --- Response Cache ---
+# Results of the helpers below, reused for a few seconds to a few minutes so
+# repeated reads within a session skip even the conditional request
+_LISTING_TTL = 60
+_CONTENT_TTL = 300
+_RESPONSE_CACHE_SIZE = 256
+_SHA_CACHE_SIZE = 256
+_FILE_SHA_CACHE_SIZE = 2048
+# LRU like the ETag cache: least recently used entries go first when full
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_LOCK = threading.Lock()
+# Blob SHAs seen in directory listings, and decoded file contents by blob SHA
+_FILE_SHAS = OrderedDict()
+_CONTENT_BY_SHA = OrderedDict()
+
+
+def _cache(ttl: float):
+    """Decorator caching a helper's successful results for ttl seconds, keyed by its arguments."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _RESPONSE_LOCK:
+                cached = _RESPONSE_CACHE.get(key)
+                if cached is not None:
+                    if cached[0] > now:
+                        _RESPONSE_CACHE.move_to_end(key)
+                    else:
+                        del _RESPONSE_CACHE[key]
+                        cached = None
+            if cached is not None:
+                # Callers add their status to the result, so hand out a copy
+                return dict(cached[1])
+
+            result = func(*args, **kwargs)
+            if isinstance(result, dict) and "error" not in result:
+                with _RESPONSE_LOCK:
+                    _RESPONSE_CACHE[key] = (now + ttl, dict(result))
+                    _RESPONSE_CACHE.move_to_end(key)
+                    while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+                        _RESPONSE_CACHE.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
+
+def _remember_content(sha: str, result: dict):
+    """Store decoded file content under its blob SHA."""
+    with _RESPONSE_LOCK:
+        _CONTENT_BY_SHA[sha] = dict(result)
+        _CONTENT_BY_SHA.move_to_end(sha)
+        while len(_CONTENT_BY_SHA) > _SHA_CACHE_SIZE:
+            _CONTENT_BY_SHA.popitem(last=False)
+
 # --- Helper Functions ---
 
-def _make_github_request(url: str, headers: dict, params: dict = None):
+def _make_github_request(url: str, params: dict = None, raw: bool = False):
     """Makes a request to the GitHub API and handles basic error checking."""
+    data, _ = _request_page(url, params=params, raw=raw)
+    return data
+
+
+def _request_page(url: str, params: dict = None, raw: bool = False):
+    """
+    Makes a request to the GitHub API, returning the data and the URL of the next page (or None).
+
+    With raw=True file contents are requested as the raw media type and returned
+    as bytes; other responses (e.g. directory listings) are still parsed JSON.
+    Raw bodies can be large, so they skip the ETag cache.
+    """
+    cache_key = (url, frozenset(params.items()) if params else None)
+    with _ETAG_LOCK:
+        cached = None if raw else _ETAG_CACHE.get(cache_key)
+        if cached is not None:
+            _ETAG_CACHE.move_to_end(cache_key)
+    headers = {}
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    if raw:
+        headers["Accept"] = _RAW_MEDIA_TYPE
     try:
-        response = requests.get(
+        response = _SESSION.get(
             url,
-            headers=headers,
             params=params,
-            timeout=HTTP_TIMEOUT
+            headers=headers or None,
+            timeout=HTTP_TIMEOUT,
+            stream=raw
         )
         response.raise_for_status()
+        if response.status_code == 304 and cached:
+            return cached[1], cached[2]
         if response.status_code == 204:
-            return {}
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type:
-            return response.json()
-        else:
+            return {}, None
+        next_url = response.links.get("next", {}).get("url")
+        if raw and "raw" in response.headers.get("X-GitHub-Media-Type", ""):
+            # Read the streamed file body into one bytes object instead of
+            # joining requests' chunk list, then hand the connection back
+            try:
+                return response.raw.read(decode_content=True), None
+            finally:
+                response.close()
+        # GitHub answers in JSON, so parse the bytes directly and only look at
+        # the content type when that fails
+        try:
+            data = serialization.loads(response.content)
+        except serialization.JSONDecodeError:
             # Return non-JSON as an error or raw content if needed by caller
-            print(f"[GitHub Tool Warning] Non-JSON response from {url}. Content-Type: {content_type}")
-            return {"warning": f"Unexpected content type received: {content_type}", "content": response.text}
+            content_type = response.headers.get("Content-Type", "")
+            logger.warning("[GitHub Tool Warning] Non-JSON response from %s. Content-Type: %s", url, content_type)
+            return {"warning": f"Unexpected content type received: {content_type}", "content": response.text}, None
+        etag = response.headers.get("ETag")
+        if etag and not raw:
+            with _ETAG_LOCK:
+                _ETAG_CACHE[cache_key] = (etag, data, next_url)
+                _ETAG_CACHE.move_to_end(cache_key)
+                while len(_ETAG_CACHE) > _ETAG_CACHE_SIZE:
+                    _ETAG_CACHE.popitem(last=False)
+        return data, next_url
     except requests.exceptions.RequestException as e:
         status_code = e.response.status_code if e.response is not None else "N/A"
         error_message = f"GitHub API request failed (Status: {status_code}): {str(e)}"
-        try:
-            if e.response is not None and "application/json" in e.response.headers.get("Content-Type", ""):
-                error_detail = e.response.json().get("message", "No additional details")
+        if e.response is not None:
+            try:
+                error_body = serialization.loads(e.response.content)
+                error_detail = error_body.get("message", "No additional details") if isinstance(error_body, dict) else error_body
                 error_message += f". Detail: {error_detail}"
-            elif e.response is not None:
-                 error_message += f". Response Text: {e.response.text[:200]}"
-        except Exception as parse_err:
-            print(f"Could not parse error response detail: {parse_err}")
-        print(f"[GitHub Tool Error] Request URL: {e.request.url if e.request else 'N/A'}, Status: {status_code}, Message: {error_message}")
-        return {"error": error_message}
+            except serialization.JSONDecodeError:
+                error_message += f". Response Text: {e.response.text[:200]}"
+            except Exception as parse_err:
+                logger.debug("Could not parse error response detail: %s", parse_err)
+        logger.warning("[GitHub Tool Error] Request URL: %s, Status: %s, Message: %s", e.request.url if e.request else 'N/A', status_code, error_message)
+        return {"error": error_message}, None
     except Exception as e:
         error_message = f"An unexpected error occurred during GitHub API request: {str(e)}"
-        print(f"[GitHub Tool Error] {error_message}")
-        return {"error": error_message}
+        logger.warning("[GitHub Tool Error] %s", error_message)
+        return {"error": error_message}, None
+
+
+def _paginate(url: str, params: dict = None, max_items: int = None, keep=None):
+    """
+    Fetches a list endpoint page by page, following the Link header's rel="next" URL.
+
+    Stops early once max_items collected items satisfy keep (all items if keep is None).
+    An error on the first page is returned as is; on a later page the items
+    collected so far are returned.
+    """
+    items = []
+    kept = 0
+    while url:
+        data, url = _request_page(url, params=params)
+        params = None # The next link already carries the query string
+        if not isinstance(data, list):
+            if items:
+                logger.warning("[GitHub Tool Warning] Stopped paginating after %d items: %.200s", len(items), data)
+                return items
+            return data
+        items.extend(data)
+        if max_items is not None:
+            kept += sum(1 for item in data if keep is None or keep(item))
+            if kept >= max_items:
+                break
+    return items
+
+
+def _is_owned_by(repo_raw, owner: str) -> bool:
+    """Whether a raw repository entry belongs to the given owner."""
+    full_name = repo_raw.get("full_name") if isinstance(repo_raw, dict) else None
+    return bool(full_name) and full_name.split('/')[0].lower() == owner.lower()
+
+
+def _graphql(query: str, variables: dict = None):
+    """Runs a query against the GitHub GraphQL API, returning its data or an error dict."""
+    try:
+        response = _SESSION.post(
+            _GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            timeout=HTTP_TIMEOUT
+        )
+        response.raise_for_status()
+        payload = serialization.loads(response.content)
+    except Exception as e:
+        logger.warning("[GitHub Tool Error] GraphQL request failed: %s", e)
+        return {"error": f"GitHub GraphQL request failed: {str(e)}"}
+
+    if payload.get("errors"):
+        messages = "; ".join(error.get("message", "Unknown error") for error in payload["errors"])
+        return {"error": f"GitHub GraphQL query failed: {messages}"}
+    return payload.get("data") or {}
+
+
+@_cache(_LISTING_TTL)
+def _list_user_repositories(owner: str):
+    """Lists repositories owned by a user or organization with a single GraphQL query, falling back to REST."""
+    data = _graphql(_REPOSITORIES_QUERY, {"owner": owner, "first": GITHUB_RESULTS_LIMIT})
+    repository_owner = data.get("repositoryOwner") if "error" not in data else None
+    if not repository_owner:
+        logger.debug("GraphQL repository listing unavailable for '%s' (%s). Falling back to REST endpoints.", owner, data.get('error', 'owner not found'))
+        return _list_user_repositories_rest(owner)
+
+    repositories = repository_owner["repositories"]
+    repos = [
+        {
+            "full_name": node["nameWithOwner"],
+            "name": node["name"],
+            "description": node.get("description") or "No description",
+            "url": node["url"],
+            "stars": node.get("stargazerCount", 0),
+            "private": node.get("isPrivate", False),
+            "last_updated": node.get("updatedAt")
+        }
+        for node in repositories["nodes"] if node
+    ]
+    if not repos:
+        return {"error": f"No repositories found or accessible for '{owner}' via any relevant endpoint."}
 
+    logger.debug("Fetched %d of %d repos owned by '%s' via GraphQL.", len(repos), repositories['totalCount'], owner)
+    return {"repositories": repos, "total_owned_found_in_batch": repositories["totalCount"]}
 
-def _list_user_repositories(owner: str, headers: dict):
+
+def _list_user_repositories_rest(owner: str):
     """Lists repositories accessible to the authenticated user, preferentially using the /user/repos endpoint."""
 
     # Common parameters for listing repos
     params = {
         "affiliation": "owner,collaborator,organization_member", # Be explicit about relationships
         "sort": "updated", # Sort by most recently updated
-        "per_page": 100 # Fetch max per page
+        "per_page": 100 # Fetch max per page, further pages follow the Link header
         # 'type': 'all' is default for /user/repos, not needed explicitly here
     }
-
-    # --- Attempt 1: Use the /user/repos endpoint (best for authenticated user's view) ---
-    auth_user_url = "https://api.github.com/user/repos"
-    print(f"Attempting to list repos for authenticated user via: {auth_user_url} with params: {params}")
-    auth_user_data = _make_github_request(auth_user_url, headers, params=params)
-
-    all_repos_data = []
-
-    # Prioritize results from /user/repos if successful and seems relevant
-    # Heuristic: If the owner requested is likely the authenticated user (can't know for sure without another API call)
-    # Let's assume for now that if this call works, it's the primary source.
-    if isinstance(auth_user_data, list):
-        print(f"Successfully fetched {len(auth_user_data)} repos using /user/repos endpoint.")
-        all_repos_data = auth_user_data # Use this list primarily
-    elif isinstance(auth_user_data, dict) and "error" in auth_user_data:
-        print(f"/user/repos endpoint failed (Error: {auth_user_data.get('error')}). Will try specific user/org endpoints for '{owner}'.")
-        # Fall through to try specific user/org endpoints
-    else:
-        print(f"Unexpected response format from /user/repos: {type(auth_user_data)}. Response: {str(auth_user_data)[:200]}")
-        # Fall through
-
-    # --- Attempt 2: Fallback/Specific User/Org (if /user/repos failed or returned nothing) ---
-    # Only run this if the authenticated user call failed or returned nothing.
-    if not all_repos_data:
-        print(f"Falling back to specific user/org endpoints for '{owner}'.")
-        user_url = f"https://api.github.com/users/{owner}/repos"
-        # Add type=all here, as it's not default for /users/{owner}/repos
-        user_params = params.copy()
-        user_params["type"] = "all"
-        print(f"Attempting to list repos for user '{owner}' using url: {user_url} with params: {user_params}")
-        user_data = _make_github_request(user_url, headers, params=user_params)
-
-        if isinstance(user_data, list):
-            print(f"Successfully fetched {len(user_data)} repos from user endpoint for '{owner}'.")
-            all_repos_data.extend(user_data) # Add to potentially empty list
-        elif isinstance(user_data, dict) and "error" in user_data:
-            print(f"User endpoint failed for '{owner}' (Error: {user_data.get('error')}). Will try organization endpoint.")
-        else:
-            print(f"Unexpected response format from user endpoint for {owner}: {type(user_data)}. Response: {str(user_data)[:200]}")
-
-        # Try organization endpoint
-        org_url = f"https://api.github.com/orgs/{owner}/repos"
-        # Add type=all here too
-        org_params = params.copy()
-        org_params["type"] = "all"
-        print(f"Attempting to list repos for organization '{owner}' using url: {org_url} with params: {org_params}")
-        org_data = _make_github_request(org_url, headers, params=org_params)
-
-        if isinstance(org_data, list):
-            print(f"Successfully fetched {len(org_data)} repos from organization endpoint for '{owner}'.")
-            # Combine results, avoiding duplicates based on 'full_name'
-            existing_full_names = {repo.get("full_name") for repo in all_repos_data if repo and isinstance(repo, dict)}
-            for repo in org_data:
-                if repo and isinstance(repo, dict) and repo.get("full_name") not in existing_full_names:
-                    all_repos_data.append(repo)
-        elif isinstance(org_data, dict) and "error" in org_data:
-             print(f"Organization endpoint failed or returned error for '{owner}' (Error: {org_data.get('error')}).")
-             if not all_repos_data: # If we got nothing from user AND org failed
-                  return {"error": f"Could not list repositories for user or organization '{owner}'. All specific endpoints failed or returned errors. Check PAT scope ('repo') and existence of user/org."}
+    # type=all is not the default for the specific user/org endpoints
+    owner_params = params.copy()
+    owner_params["type"] = "all"
+
+    # Query the authenticated user, user and organization endpoints at once:
+    # each call is mostly network wait, so three threads cost one round trip
+    endpoints = [
+        ("/user/repos", "https://api.github.com/user/repos", params),
+        ("user endpoint", f"https://api.github.com/users/{owner}/repos", owner_params),
+        ("organization endpoint", f"https://api.github.com/orgs/{owner}/repos", owner_params),
+    ]
+    responses = {}
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            # Endpoints sort by last update, so paging stops once enough owned repos are in
+            executor.submit(
+                _paginate, url, params=endpoint_params, max_items=GITHUB_RESULTS_LIMIT,
+                keep=lambda repo_raw: _is_owned_by(repo_raw, owner)
+            ): tag
+            for tag, url, endpoint_params in endpoints
+        }
+        for future in as_completed(futures):
+            responses[futures[future]] = future.result()
+
+    # Merge in priority order: inserting by full_name is the dedupe, and
+    # setdefault lets /user/repos entries win over the other endpoints
+    by_name = {}
+    any_succeeded = False
+    for tag, url, _ in endpoints:
+        data = responses[tag]
+        if isinstance(data, list):
+            logger.debug("Successfully fetched %d repos from %s (%s).", len(data), tag, url)
+            any_succeeded = True
+            for repo_raw in data:
+                if isinstance(repo_raw, dict) and repo_raw.get("full_name"):
+                    by_name.setdefault(repo_raw["full_name"], repo_raw)
+        elif isinstance(data, dict) and "error" in data:
+            logger.debug("%s failed for '%s' (Error: %s).", tag, owner, data.get('error'))
         else:
-            print(f"Unexpected response format from org endpoint for {owner}: {type(org_data)}. Response: {str(org_data)[:200]}")
-            # Proceed if we got user data earlier
+            logger.debug("Unexpected response format from %s for %s: %s. Response: %.200s", tag, owner, type(data), data)
+            any_succeeded = True
+
+    if not by_name and not any_succeeded:
+        return {"error": f"Could not list repositories for user or organization '{owner}'. All endpoints failed or returned errors. Check PAT scope ('repo') and existence of user/org."}
 
     # --- Process final list ---
-    if not all_repos_data:
-         print(f"No repository data retrieved after checking all relevant endpoints for '{owner}'.")
+    if not by_name:
+         logger.debug("No repository data retrieved after checking all relevant endpoints for '%s'.", owner)
          return {"error": f"No repositories found or accessible for '{owner}' via any relevant endpoint."}
 
-    # Process the combined/retrieved list
-    repos = []
-    processed_full_names = set()
-    for repo_raw in all_repos_data:
-         if not repo_raw or not isinstance(repo_raw, dict): continue
-         full_name_raw = repo_raw.get("full_name")
-         if not full_name_raw or full_name_raw in processed_full_names: continue
-
-         # Filter here: Only include repos actually owned by the requested 'owner'
-         # This is needed because /user/repos returns ALL accessible repos (collaborator, org member etc)
-         if full_name_raw.split('/')[0].lower() != owner.lower():
-             print(f"  Skipping '{full_name_raw}' as owner does not match requested '{owner}'.")
-             continue
-
-         repos.append({
-             "full_name": full_name_raw,
-             "name": repo_raw.get("name"),
-             "description": repo_raw.get("description", "No description") or "No description",
-             "url": repo_raw.get("html_url"),
-             "stars": repo_raw.get("stargazers_count", 0),
-             "private": repo_raw.get("private", False),
-             "last_updated": repo_raw.get("updated_at")
-         })
-         processed_full_names.add(full_name_raw)
+    # Only include repos actually owned by the requested 'owner':
+    # /user/repos returns ALL accessible repos (collaborator, org member etc)
+    repos = [
+        {
+            "full_name": full_name,
+            "name": repo_raw.get("name"),
+            "description": repo_raw.get("description", "No description") or "No description",
+            "url": repo_raw.get("html_url"),
+            "stars": repo_raw.get("stargazers_count", 0),
+            "private": repo_raw.get("private", False),
+            "last_updated": repo_raw.get("updated_at")
+        }
+        for full_name, repo_raw in by_name.items() if _is_owned_by(repo_raw, owner)
+    ]
+    if len(repos) < len(by_name):
+        logger.debug("  Skipped %d repos not owned by '%s'.", len(by_name) - len(repos), owner)
 
     # Sort by last updated descending
     repos.sort(key=lambda x: x.get("last_updated", ""), reverse=True)
 
     # Limit the number of results shown
     limited_repos = repos[:GITHUB_RESULTS_LIMIT]
-    print(f"Processed {len(repos)} unique repos owned by '{owner}', returning {len(limited_repos)} after sorting.")
+    logger.debug("Processed %d unique repos owned by '%s', returning %d after sorting.", len(repos), owner, len(limited_repos))
     # Adjust total count reporting if needed, maybe report total OWNED found vs total accessible found
     return {"repositories": limited_repos, "total_owned_found_in_batch": len(repos)}
 
 
-def _get_repo_structure(owner: str, repo: str, path: str, headers: dict):
+@_cache(_LISTING_TTL)
+def _get_repo_structure(owner: str, repo: str, path: str):
     """Fetches the structure (files/dirs) of a path in a repository."""
     path = path.strip('/') if path else ''
     url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    print(f"Attempting to get structure for {owner}/{repo}/{path} using url: {url}") # Debug print
-    data = _make_github_request(url, headers)
+    logger.debug("Attempting to get structure for %s/%s/%s using url: %s", owner, repo, path, url)
+    data = _make_github_request(url)
 
     if "error" in data:
         return data
     if isinstance(data, dict) and "warning" in data: # Pass warnings through
-        print(f"Warning from _make_github_request: {data['warning']}")
+        logger.debug("Warning from _make_github_request: %s", data['warning'])
 
     if isinstance(data, list):
         structure = [
             {"name": item["name"], "type": item["type"], "path": item["path"]}
             for item in data if isinstance(item, dict) # Ensure item is dict
         ]
+        # A fresh listing vouches for file SHAs until the listing itself expires
+        expiry = time.monotonic() + _LISTING_TTL
+        with _RESPONSE_LOCK:
+            for item in data:
+                if isinstance(item, dict) and item.get("type") == "file" and item.get("sha"):
+                    key = (owner, repo, item["path"])
+                    _FILE_SHAS[key] = (expiry, item["sha"])
+                    _FILE_SHAS.move_to_end(key)
+            while len(_FILE_SHAS) > _FILE_SHA_CACHE_SIZE:
+                _FILE_SHAS.popitem(last=False)
         return {"structure": structure}
     elif isinstance(data, dict) and data.get("type") == "file":
          # If the path given was actually a file, return error specific to structure listing
-         print(f"Path '{path}' in {owner}/{repo} is a file, not a directory.")
+         logger.debug("Path '%s' in %s/%s is a file, not a directory.", path, owner, repo)
          return {"error": f"Path '{path}' is a file. Use 'get_file_content' to read its content."}
     else:
-        print(f"Path '{path}' in {owner}/{repo} is not a directory or recognizable structure (response type: {type(data)}).") # Debug print
+        logger.debug("Path '%s' in %s/%s is not a directory or recognizable structure (response type: %s).", path, owner, repo, type(data))
         return {"error": f"Path '{path}' does not appear to be a directory or structure could not be retrieved."}
 
-def _get_file_content(owner: str, repo: str, path: str, headers: dict):
+@_cache(_CONTENT_TTL)
+def _get_file_content(owner: str, repo: str, path: str):
     """Fetches the content of a file in a repository."""
     path = path.strip('/')
     if not path:
         return {"error": "File path cannot be empty for 'get_file_content'."}
 
+    # Content for a blob SHA never changes, so a recent listing's SHA is enough
+    with _RESPONSE_LOCK:
+        known = _FILE_SHAS.get((owner, repo, path))
+        sha = known[1] if known and known[0] > time.monotonic() else None
+        cached = _CONTENT_BY_SHA.get(sha) if sha else None
+    if cached is not None:
+        logger.debug("Using cached content for %s/%s/%s (sha %.7s)", owner, repo, path, sha)
+        return dict(cached)
+
     url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    print(f"Attempting to get content for {owner}/{repo}/{path} using url: {url}") # Debug print
-    data = _make_github_request(url, headers)
+    logger.debug("Attempting to get content for %s/%s/%s using url: %s", owner, repo, path, url)
+    # Raw media type: the file bytes come back directly, with no base64 JSON envelope to decode
+    data = _make_github_request(url, raw=True)
+
+    if isinstance(data, bytes):
+        content_decoded = data.decode("utf-8", errors="replace")
+        logger.debug("Successfully read content for %s/%s/%s, length: %d", owner, repo, path, len(content_decoded))
+        result = {
+            "file_path": path,
+            "content": content_decoded, # Return full content
+            "size": len(data)
+        }
+        if sha:
+            _remember_content(sha, result)
+        return result
 
+    # Anything else is a JSON answer: an error, a directory listing, or a file
+    # envelope from a server that ignored the raw media type
     if "error" in data:
         return data
     if isinstance(data, dict) and "warning" in data:
-        print(f"Warning from _make_github_request: {data['warning']}")
+        logger.debug("Warning from _make_github_request: %s", data['warning'])
         # Continue if content might still be usable, or decide how to handle non-JSON
 
 
@@ -208,11 +459,11 @@ def _get_file_content(owner: str, repo: str, path: str, headers: dict):
         encoding = data.get("encoding")
 
         if not content_encoded or encoding != "base64":
-            print(f"Could not get base64 content for {owner}/{repo}/{path}. Encoding: {encoding}, Content available: {bool(content_encoded)}") # Debug print
+            logger.debug("Could not get base64 content for %s/%s/%s. Encoding: %s, Content available: %s", owner, repo, path, encoding, bool(content_encoded))
             return {"error": f"Could not retrieve base64 encoded content for file: {path}"}
 
         try:
-            content_decoded = base64.b64decode(content_encoded).decode("utf-8")
+            content_decoded = base64.b64decode(content_encoded).decode("utf-8", errors="replace")
 
             # --- REMOVED TRUNCATION ---
             # max_len = 10000
@@ -221,24 +472,28 @@ def _get_file_content(owner: str, repo: str, path: str, headers: dict):
             #     print(f"Warning: Truncated content for file {path}")
             # --- END REMOVED TRUNCATION ---
 
-            print(f"Successfully decoded content for {owner}/{repo}/{path}, length: {len(content_decoded)}") # Debug print
-            return {
+            logger.debug("Successfully decoded content for %s/%s/%s, length: %d", owner, repo, path, len(content_decoded))
+            result = {
                 "file_path": path,
                 "content": content_decoded, # Return full decoded content
                 "size": data.get("size")
             }
+            if data.get("sha"):
+                _remember_content(data["sha"], result)
+            return result
         except Exception as e:
-            print(f"Error decoding content for {owner}/{repo}/{path}: {str(e)}") # Debug print
+            logger.debug("Error decoding content for %s/%s/%s: %s", owner, repo, path, e)
             return {"error": f"Failed to decode file content for {path}: {str(e)}"}
     elif isinstance(data, list):
-         print(f"Path '{path}' in {owner}/{repo} appears to be a directory when getting content.") # Debug print
+         logger.debug("Path '%s' in %s/%s appears to be a directory when getting content.", path, owner, repo)
          return {"error": f"Path '{path}' appears to be a directory. Use 'get_repo_structure'."}
     else:
-        print(f"Could not get file content for {owner}/{repo}/{path}. Response type: {type(data)}, Keys: {list(data.keys()) if isinstance(data, dict) else 'N/A'}") # Debug print
+        logger.debug("Could not get file content for %s/%s/%s. Response type: %s, Keys: %s", owner, repo, path, type(data), list(data.keys()) if isinstance(data, dict) else 'N/A')
         return {"error": f"Could not retrieve file content for path: {path}. Is the path correct? Response: {str(data)[:200]}"}
 
 
-def _search_code(owner: str, repo: str, query: str, headers: dict):
+@_cache(_LISTING_TTL)
+def _search_code(owner: str, repo: str, query: str):
     """Searches for code within a specific repository."""
     if not query:
         return {"error": "Search query cannot be empty for 'search_code'."}
@@ -248,31 +503,32 @@ def _search_code(owner: str, repo: str, query: str, headers: dict):
         "q": f"{query} repo:{owner}/{repo}",
         "per_page": GITHUB_RESULTS_LIMIT
     }
-    print(f"Attempting to search code in {owner}/{repo} for '{query}' using url: {search_url} with params: {params}")
-    data = _make_github_request(search_url, headers, params=params)
+    logger.debug("Attempting to search code in %s/%s for '%s' using url: %s with params: %s", owner, repo, query, search_url, params)
+    data = _make_github_request(search_url, params=params)
 
     if "error" in data:
         return data
     if isinstance(data, dict) and "warning" in data:
-        print(f"Warning from _make_github_request: {data['warning']}")
+        logger.debug("Warning from _make_github_request: %s", data['warning'])
 
     results = []
     total_count = 0
     if isinstance(data, dict) and "items" in data:
         total_count = data.get("total_count", 0)
-        for item in data["items"]:
-            snippets = []
-            text_matches = item.get("text_matches")
-            if isinstance(text_matches, list):
-                snippets = [match["fragment"] for match in text_matches if isinstance(match, dict) and "fragment" in match]
-
-            results.append({
+        # text_matches only appears when text-match metadata is requested, so it stays optional
+        results = [
+            {
                 "path": item.get("path"),
                 "score": item.get("score"),
                 "url": item.get("html_url"),
-                "snippets": snippets
-            })
-    print(f"Found {total_count} total results for query '{query}', returning {len(results)}")
+                "snippets": [
+                    match["fragment"] for match in (item.get("text_matches") or ())
+                    if isinstance(match, dict) and "fragment" in match
+                ]
+            }
+            for item in data["items"]
+        ]
+    logger.debug("Found %d total results for query '%s', returning %d", total_count, query, len(results))
     return {
         "query": query,
         "total_results": total_count,
@@ -283,12 +539,12 @@ def _search_code(owner: str, repo: str, query: str, headers: dict):
 # --- Tool Definition ---
 @tool(
     name="github_tool",
-    description="Interacts with GitHub repositories and users. Allows listing user/org repositories (public and private accessible via PAT using the /user/repos endpoint when applicable), listing directory structures within a repo, reading file contents (returns full content), and searching code within a specific repository.", # Updated description
+    description="Interacts with GitHub repositories and users. Allows listing user/org repositories (public and private accessible via PAT using the /user/repos endpoint when applicable), listing directory structures within a repo, reading file contents (returns full content, one file or several at once), and searching code within a specific repository.", # Updated description
     parameters={
         "action": {
             "type": "string",
             "description": "The specific action to perform.",
-            "enum": ["list_user_repositories", "get_repo_structure", "get_file_content", "search_code"],
+            "enum": ["list_user_repositories", "get_repo_structure", "get_file_content", "get_file_contents", "search_code"],
         },
         "owner": {
             "type": "string",
@@ -296,7 +552,7 @@ def _search_code(owner: str, repo: str, query: str, headers: dict):
         },
         "repo": {
             "type": "string",
-            "description": "The name of the GitHub repository. Required for 'get_repo_structure', 'get_file_content', and 'search_code'. Not used for 'list_user_repositories'.",
+            "description": "The name of the GitHub repository. Required for 'get_repo_structure', 'get_file_content', 'get_file_contents', and 'search_code'. Not used for 'list_user_repositories'.",
             "optional": True
         },
         "path": {
@@ -304,6 +560,12 @@ def _search_code(owner: str, repo: str, query: str, headers: dict):
             "description": "The path to a file or directory within the repository (used for 'get_repo_structure' and 'get_file_content'). Omit or use '/' for the root directory.",
             "optional": True
         },
+        "paths": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Paths of several files to read at once (used only for 'get_file_contents'). Prefer this over repeated 'get_file_content' calls.",
+            "optional": True
+        },
         "query": {
             "type": "string",
             "description": "The code search query (used only for 'search_code'). Supports GitHub search syntax.",
@@ -311,7 +573,7 @@ def _search_code(owner: str, repo: str, query: str, headers: dict):
         }
     }
 )
-def execute(action: str, owner: str, repo: str = None, path: str = None, query: str = None, **kwargs):
+def execute(action: str, owner: str, repo: str = None, path: str = None, query: str = None, paths: list = None, **kwargs):
     """Executes a specific action on GitHub."""
 
     if not GITHUB_PAT or GITHUB_PAT == "your_github_pat_here":
@@ -320,23 +582,17 @@ def execute(action: str, owner: str, repo: str = None, path: str = None, query:
             "_tool_status": "❌ Error: GitHub PAT not configured."
         }
 
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "Authorization": f"Bearer {GITHUB_PAT}",
-        "User-Agent": USER_AGENT
-    }
-
     if not owner:
         return {"error": "GitHub owner (username or organization) is required.", "_tool_status": "❌ Error: Missing owner."}
 
     result = {}
     status_details = ""
 
-    print(f"[GitHub Tool Execute] Action: {action}, Owner: {owner}, Repo: {repo}, Path: {path}, Query: {query}")
+    logger.debug("[GitHub Tool Execute] Action: %s, Owner: %s, Repo: %s, Path: %s, Query: %s", action, owner, repo, path, query)
 
     # --- Action Dispatching ---
     if action == "list_user_repositories":
-        result = _list_user_repositories(owner, headers)
+        result = _list_user_repositories(owner)
         # Create status message based on results
         repo_count = 0
         total_found = 0
@@ -354,7 +610,7 @@ def execute(action: str, owner: str, repo: str = None, path: str = None, query:
     elif action == "get_repo_structure":
         if not repo:
             return {"error": f"Repository name ('repo') is required for action '{action}'.", "_tool_status": f"❌ Error: Missing repo for {action}."}
-        result = _get_repo_structure(owner, repo, path, headers)
+        result = _get_repo_structure(owner, repo, path)
         if "error" not in result and "structure" in result:
              status_details = f"Listed structure for '{owner}/{repo}/{path or ''}' ({len(result['structure'])} items)"
         elif "error" not in result:
@@ -365,19 +621,38 @@ def execute(action: str, owner: str, repo: str = None, path: str = None, query:
             return {"error": f"Repository name ('repo') is required for action '{action}'.", "_tool_status": f"❌ Error: Missing repo for {action}."}
         if not path:
              return {"error": "File path is required for 'get_file_content'.", "_tool_status": "❌ Error: Missing path for get_file_content."}
-        result = _get_file_content(owner, repo, path, headers)
+        result = _get_file_content(owner, repo, path)
         if "error" not in result and "content" in result:
              status_details = f"Read file content for '{owner}/{repo}/{path}' ({len(result['content'])} chars)"
         elif "error" not in result:
               status_details = f"Completed reading attempt for '{owner}/{repo}/{path}', but no content retrieved."
 
+    elif action == "get_file_contents":
+        if not repo:
+            return {"error": f"Repository name ('repo') is required for action '{action}'.", "_tool_status": f"❌ Error: Missing repo for {action}."}
+        if not paths:
+            return {"error": "A list of file paths ('paths') is required for 'get_file_contents'.", "_tool_status": "❌ Error: Missing paths for get_file_contents."}
+        # Read the files concurrently, keeping the requested order; five at a
+        # time stays well within GitHub's secondary rate limits
+        with ThreadPoolExecutor(max_workers=_FILE_FETCH_WORKERS) as executor:
+            files = list(executor.map(lambda file_path: _get_file_content(owner, repo, file_path), paths))
+        for file_path, file_result in zip(paths, files):
+            if "error" in file_result:
+                file_result["file_path"] = file_path
+        read_count = sum(1 for file_result in files if "error" not in file_result)
+        if read_count:
+            result = {"files": files}
+            status_details = f"Read {read_count} of {len(paths)} files from '{owner}/{repo}'"
+        else:
+            result = {"error": f"Could not read any of the {len(paths)} requested files from '{owner}/{repo}'.", "files": files}
+
 
     elif action == "search_code":
         if not repo:
             return {"error": f"Repository name ('repo') is required for action '{action}'.", "_tool_status": f"❌ Error: Missing repo for {action}."}
         if not query:
             return {"error": "Search query is required for 'search_code'.", "_tool_status": "❌ Error: Missing query for search_code."}
-        result = _search_code(owner, repo, query, headers)
+        result = _search_code(owner, repo, query)
         showing = result.get("showing_results", 0) if isinstance(result, dict) else 0
         total = result.get("total_results", 0) if isinstance(result, dict) else 0
         status_details = f"Searched code in '{owner}/{repo}' for query: '{query}'. Found {total} total matches, showing {showing}."
@@ -393,7 +668,7 @@ def execute(action: str, owner: str, repo: str = None, path: str = None, query:
         result["_tool_status"] = f"✓ github_tool ({action}): {status_details}"
     else:
         # Fallback if no error and no status details were set (should happen less often now)
-        print(f"Warning: No error and no status details generated for action '{action}'. Result: {str(result)[:200]}")
+        logger.debug("Warning: No error and no status details generated for action '%s'. Result: %.200s", action, result)
         result["_tool_status"] = f"✓ github_tool ({action}): Completed."
 
     return result
\ No newline at end of file
@@ -1,8 +1,8 @@
 # tools/registry.py
 """Registry for tools with improved context support for tracking."""
 
-import os
 import importlib
+import pkgutil
 import inspect
 import json
 import re
@@ -14,6 +14,13 @@ TOOLS = {}
 _tool_context = {}
 _tools_discovered = False
 
+# Modules in this package that do not define tools
+_NON_TOOL_MODULES = {"registry"}
+
+# Bumped whenever a tool is registered, so schema caches know when to rebuild
+_registry_version = 0
+_schemas_cache = None
+
 def get_tool_context():
     """Get the current tool context."""
     return _tool_context
@@ -36,19 +43,32 @@ def tool(name, description, parameters=None):
         Decorator function
     """
     def decorator(func):
-        # Register the tool
+        global _registry_version, _schemas_cache
+        _registry_version += 1
+        _schemas_cache = None
+        
+        # Register the tool, building its function calling schema once here
         TOOLS[name] = {
             "function": func,
             "description": description,
-            "parameters": parameters or {}
+            "parameters": parameters or {},
+            "schema": _build_schema(name, description, parameters or {})
         }
         
+        # Functions that cannot take the tool manager are returned as is,
+        # without a wrapper frame on every call
+        signature_params = inspect.signature(func).parameters.values()
+        if not any(param.name == '_tool_manager' or param.kind is inspect.Parameter.VAR_KEYWORD
+                   for param in signature_params):
+            return func
+        
         # Wrap the function to access the tool context
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Include the tool manager in kwargs if available
-            if 'tool_manager' in _tool_context:
-                kwargs['_tool_manager'] = _tool_context['tool_manager']
+            tool_manager = _tool_context.get('tool_manager')
+            if tool_manager is not None:
+                kwargs['_tool_manager'] = tool_manager
             
             # Call the original function
             return func(*args, **kwargs)
@@ -71,44 +91,55 @@ def get_tool_function(name):
         return TOOLS[name]["function"]
     return None
 
+def get_registry_version():
+    """Get a counter that changes whenever the set of tools changes."""
+    return _registry_version
+
+def _build_schema(name, description, parameters):
+    """Build the function calling schema for a tool."""
+    # Ensure the parameters schema is correct
+    parameters_schema = {
+        "type": "object",  # This is crucial - parameters must be an object
+        "properties": {},
+        "required": []
+    }
+    
+    # Add properties from the tool definition
+    for param_name, param_info in parameters.items():
+        parameters_schema["properties"][param_name] = param_info
+        
+        # Add to required list if not marked as optional
+        if not (isinstance(param_info, dict) and param_info.get("optional", False)):
+            parameters_schema["required"].append(param_name)
+    
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": parameters_schema
+        }
+    }
+
 def get_all_schemas():
     """
     Get all tool schemas for function calling.
     
+    The list is built once and reused until another tool is registered.
+    
     Returns:
         List of tool schemas
     """
-    schemas = []
-    
-    for name, info in TOOLS.items():
-        # Ensure the parameters schema is correct
-        parameters_schema = {
-            "type": "object",  # This is crucial - parameters must be an object
-            "properties": {},
-            "required": []
-        }
-        
-        # Add properties from the tool definition
-        if info["parameters"]:
-            for param_name, param_info in info["parameters"].items():
-                parameters_schema["properties"][param_name] = param_info
-                
-                # Add to required list if not marked as optional
-                if not (isinstance(param_info, dict) and param_info.get("optional", False)):
-                    parameters_schema["required"].append(param_name)
-        
-        # Create the full schema
-        schema = {
-            "type": "function",
-            "function": {
-                "name": name,
-                "description": info["description"],
-                "parameters": parameters_schema
-            }
-        }
-        schemas.append(schema)
-    
-    return schemas
+    global _schemas_cache
+    if _schemas_cache is None:
+        _schemas_cache = [info["schema"] for info in TOOLS.values()]
+    return _schemas_cache
+
+def _tool_module_names():
+    """List tool module names in this package (also works from a zip or frozen install)."""
+    package_path = importlib.import_module(__package__).__path__
+    return [module.name for module in pkgutil.iter_modules(package_path)
+            if module.name not in _NON_TOOL_MODULES]
 
 def discover_tools():
     """Automatically discover tool implementations."""
@@ -116,19 +147,13 @@ def discover_tools():
     if _tools_discovered:
         return
     
-    # Get the tools directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Import all Python files in the directory
-    for filename in os.listdir(current_dir):
-        if filename.endswith('.py') and filename != '__init__.py' and filename != 'registry.py':
-            # Import the module
-            module_name = filename[:-3]
-            try:
-                importlib.import_module(f".{module_name}", package="agentic_assistant.tools")
-                print(f"✓ Registered tool module: {module_name}")
-            except Exception as e:
-                print(f"❌ Error importing tool module {module_name}: {str(e)}")
+    # Import all tool modules in the package
+    for module_name in _tool_module_names():
+        try:
+            importlib.import_module(f".{module_name}", package=__package__)
+            print(f"✓ Registered tool module: {module_name}")
+        except Exception as e:
+            print(f"❌ Error importing tool module {module_name}: {str(e)}")
     
     _tools_discovered = True
 
@@ -2,9 +2,23 @@
 """Web search implementation using SearXNG. """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .registry import tool
+from agentic_assistant.tool_cache import memoize_tool
+from agentic_assistant import serialization
 from agentic_assistant.config import SEARXNG_URL, SEARCH_RESULTS_COUNT, HTTP_TIMEOUT
 
+# Shared session keeping the connection to SearXNG alive between searches
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], respect_retry_after_header=True)
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 @tool(
     name="search_web",
     description="""Search the web using a customized SearXNG metasearch instance that aggregates results from over 40 specialized search engines.
@@ -77,6 +91,7 @@ The search supports these operator categories:
         "required": ["query"]
     }
 )
+@memoize_tool(ttl=3600)
 def execute(query, count=None):
     """Search the web using SearXNG."""
     # Use default count from config if not provided
@@ -85,7 +100,7 @@ def execute(query, count=None):
         
     try:
         # Send request to SearXNG
-        response = requests.get(
+        response = _SESSION.get(
             f"{SEARXNG_URL}/search",
             params={
                 "q": query,
@@ -95,19 +110,18 @@ def execute(query, count=None):
         )
         
         # Parse response data
-        data = response.json()
+        data = serialization.loads(response.content)
         
-        # Format results if available
-        results = []
+        # Format results if available, keeping the configured number of results
         if data.get("results"):
-            # Get the configured number of results
-            for item in data["results"][:count]:
-                result = {
+            results = [
+                {
                     "title": item.get("title", "No title"),
                     "url": item.get("url", "No URL"),
                     "snippet": item.get("content", "No content")
                 }
-                results.append(result)
+                for item in data["results"][:count]
+            ]
             
             return {
                 "results": results,
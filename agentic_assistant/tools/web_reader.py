@@ -1,83 +1,237 @@
 # tools/webpage_reader.py
 """
-Improved web content extraction using Mozilla's Readability.js via Playwright in a separate process.
+Improved web content extraction using Mozilla's Readability.js via Playwright in persistent browser workers.
 Includes uBlock Origin integration for ad-free content extraction and better resource management.
 """
 
 import os
+import pkgutil
 import sys
 import tempfile
-import urllib.request
 import json
+import logging
 import shutil
+import socket
 import time
+import atexit
+import itertools
+import queue
+import threading
 import multiprocessing
 from multiprocessing import Process, Queue
 import traceback
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .registry import tool
-from agentic_assistant.config import HTTP_TIMEOUT, USER_AGENT
+from agentic_assistant.tool_cache import memoize_tool, DEFAULT_CACHE_DIR
+from agentic_assistant.config import HTTP_TIMEOUT, USER_AGENT, TOOL_SETTINGS
+
+# Cross-process locks on the Firefox profile directories
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Progress details go to debug logging, formatted only when DEBUG is enabled
+logger = logging.getLogger(__name__)
 
 # Check if Playwright is installed
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("Warning: Playwright not available. Install with 'pip install playwright' and 'playwright install firefox'")
 
+# selectolax parses HTML in C, much faster than BeautifulSoup's html.parser
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# lxml runs XPath queries in C, used when selectolax is missing
+try:
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Containers holding the main content of a page, for the fallback extraction
+MAIN_CONTENT_SELECTOR = "main, article, .content, #content, .post, .entry"
+
+# Same queries compiled once as XPath for lxml
+if LXML_AVAILABLE:
+    _LINK_XPATH = lxml_html.etree.XPath("//a[@href and normalize-space(string())]")
+    _MAIN_XPATH = lxml_html.etree.XPath(
+        "(//main | //article | //*[@id='content']"
+        " | //*[contains(concat(' ', normalize-space(@class), ' '), ' content ')]"
+        " | //*[contains(concat(' ', normalize-space(@class), ' '), ' post ')]"
+        " | //*[contains(concat(' ', normalize-space(@class), ' '), ' entry ')])[1]"
+    )
+    _TEXT_XPATH = lxml_html.etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+
+# Page is considered ready once it has a content container or enough text
+CONTENT_READY_JS = "() => document.querySelector('main, article, .content, #content') || (document.body && document.body.innerText.length > 500)"
+CONTENT_READY_TIMEOUT_MS = 3000
+
+# Links are capped inside the page so long link lists never cross the Playwright connection
+MAX_LINKS = 200
+MAX_LINK_TEXT = 200
+# Below this many links in the article, links are collected from the whole page
+MIN_ARTICLE_LINKS = 5
+
+# Requests Readability never needs; stylesheets are kept since they decide what text is visible
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Readability.js 0.4.4, bundled under agentic_assistant/vendor and injected into pages
+VENDORED_READABILITY = "vendor/Readability.js"
+_readability_script = None
+
 # uBlock Origin XPI download URL
 UBLOCK_ORIGIN_URL = "https://addons.mozilla.org/firefox/downloads/file/4218976/ublock_origin-1.56.0.xpi"
 
-def setup_firefox_with_ublock(temp_dir):
-    """Set up Firefox with uBlock Origin"""
-    firefox_profile = os.path.join(temp_dir, "firefox_profile")
-    os.makedirs(firefox_profile, exist_ok=True)
+# Profiles and the XPI live in the cache directory so they survive between runs:
+# Firefox keeps its HTTP cache, cookies and TLS sessions, and the XPI is downloaded once
+BROWSER_CACHE_DIR = os.path.join(
+    os.path.expanduser(TOOL_SETTINGS.get("cache_dir", DEFAULT_CACHE_DIR)), "firefox"
+)
+# Persistent profiles shared by all assistant processes; workers beyond this use temporary ones
+MAX_PERSISTENT_PROFILES = 16
+
+# Shared session for the fallback and downloads, so connections to a host are reused
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = USER_AGENT
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], respect_retry_after_header=True)
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+def download_cached(url, path):
+    """Download a pinned release file unless it is already cached"""
+    if os.path.exists(path):
+        return True
+    
+    # The URLs name fixed releases, so an existing file never needs refreshing.
+    # Download to a temporary name and rename it, so concurrent workers never
+    # see a partial file.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, _SESSION.get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=65536):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.warning("Failed to download %s: %s", url, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+def load_readability_script():
+    """Get the bundled Readability.js source, read once per process"""
+    global _readability_script
+    if _readability_script is None:
+        _readability_script = pkgutil.get_data("agentic_assistant", VENDORED_READABILITY).decode("utf-8")
+    return _readability_script
+
+def _try_lock(lock_file):
+    """Take a non-blocking exclusive lock on an open file, returning whether it was taken"""
+    try:
+        if os.name == "nt":
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+def acquire_profile(preferred=0):
+    """
+    Claim a Firefox profile directory for one worker.
+    
+    Firefox refuses to open a profile another instance is using, including one
+    started by another assistant process, so profiles are claimed through a lock
+    file: the preferred one first, then the next free one. The lock is held until
+    release_profile (or until the process dies).
+    
+    Returns:
+        Tuple of (profile directory, open lock file); the lock file is None for a
+        temporary profile, used when every persistent profile is taken
+    """
+    os.makedirs(BROWSER_CACHE_DIR, exist_ok=True)
+    for offset in range(MAX_PERSISTENT_PROFILES):
+        index = (preferred + offset) % MAX_PERSISTENT_PROFILES
+        lock_file = open(os.path.join(BROWSER_CACHE_DIR, f"profile_{index}.lock"), "a+b")
+        if _try_lock(lock_file):
+            return os.path.join(BROWSER_CACHE_DIR, f"profile_{index}"), lock_file
+        lock_file.close()
     
+    logger.warning("All %d Firefox profiles are in use, using a temporary one", MAX_PERSISTENT_PROFILES)
+    return tempfile.mkdtemp(prefix="profile_", dir=BROWSER_CACHE_DIR), None
+
+def release_profile(firefox_profile, lock_file):
+    """Unlock a profile claimed by acquire_profile, deleting it if it was temporary"""
+    if lock_file is None:
+        shutil.rmtree(firefox_profile, ignore_errors=True)
+    else:
+        lock_file.close()
+
+def setup_firefox_with_ublock(firefox_profile):
+    """Set up a Firefox profile with uBlock Origin"""
     # Create extensions directory
     extensions_dir = os.path.join(firefox_profile, "extensions")
     os.makedirs(extensions_dir, exist_ok=True)
     
     # Download and install uBlock Origin
-    xpi_path = os.path.join(temp_dir, "ublock_origin.xpi")
-    try:
-        urllib.request.urlretrieve(UBLOCK_ORIGIN_URL, xpi_path)
-        shutil.copy(xpi_path, os.path.join(extensions_dir, "uBlock0@raymondhill.net.xpi"))
-        print("uBlock Origin extension installed")
-    except Exception as e:
-        print(f"Warning: Failed to download uBlock Origin: {e}")
+    xpi_path = os.path.join(BROWSER_CACHE_DIR, "ublock_origin.xpi")
+    installed_path = os.path.join(extensions_dir, "uBlock0@raymondhill.net.xpi")
+    if not os.path.exists(installed_path) and download_cached(UBLOCK_ORIGIN_URL, xpi_path):
+        shutil.copy(xpi_path, installed_path)
+        logger.info("uBlock Origin extension installed")
     
     return firefox_profile
 
-def extract_content_in_process(url, max_length, result_queue):
-    """Run the extraction in a separate process with improved resource management"""
+def preresolve_host(url):
+    """Resolve the URL's host in the background so the lookup overlaps opening the page"""
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return
+    
+    def resolve():
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+        except (OSError, UnicodeError, ValueError):
+            pass  # Firefox reports the failure when it loads the page
+    
+    threading.Thread(target=resolve, daemon=True).start()
+
+def block_unneeded_resources(route):
+    """Abort images, media and fonts, let everything else through"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+def extract_content(browser_context, url, max_length):
+    """Extract one page in an already running browser, closing only the page afterwards"""
     start_time = time.time()
-    temp_dir = None
     page = None
-    browser_context = None
-    playwright_instance = None
     
     try:
-        # Check if Playwright is available
-        try:
-            from playwright.sync_api import sync_playwright
-        except ImportError:
-            result_queue.put({
-                "error": "Playwright not available",
-                "url": url,
-                "elapsed_time": time.time() - start_time
-            })
-            return
-        
-        print(f"Starting extraction for: {url}")
-        temp_dir = tempfile.mkdtemp(prefix="webpage_reader_")
-        firefox_profile = setup_firefox_with_ublock(temp_dir)
-        
-        # Initialize Playwright resources
-        playwright_instance = sync_playwright().start()
-        browser_context = playwright_instance.firefox.launch_persistent_context(
-            user_data_dir=firefox_profile,
-            headless=True
-        )
+        logger.debug("Starting extraction for: %s", url)
+        preresolve_host(url)
         page = browser_context.new_page()
         
         # Configure page
@@ -85,13 +239,28 @@ def extract_content_in_process(url, max_length, result_queue):
         page.set_default_timeout(HTTP_TIMEOUT * 1000)
         
         # Navigate and wait for content
-        print(f"Loading {url}...")
+        logger.debug("Loading %s...", url)
         page.goto(url, wait_until="domcontentloaded")
-        page.wait_for_load_state("networkidle")
+        
+        # Wait until readable content is present rather than for network idle,
+        # which trackers and long polling can delay by seconds
+        try:
+            page.wait_for_function(CONTENT_READY_JS, timeout=CONTENT_READY_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            logger.debug("Content not detected after %d ms, extracting anyway", CONTENT_READY_TIMEOUT_MS)
         
         # Extract content
-        page.add_script_tag(url="https://unpkg.com/@mozilla/readability@0.4.4/Readability.js")
-        result = page.evaluate("""() => {
+        page.add_script_tag(content=load_readability_script())
+        
+        # Text is cut one character past max_length in the page, which is enough to
+        # tell whether it was truncated without sending the rest over the connection
+        limits = {
+            "maxLinks": MAX_LINKS,
+            "maxLinkText": MAX_LINK_TEXT,
+            "minArticleLinks": MIN_ARTICLE_LINKS,
+            "maxLength": max_length + 1
+        }
+        result = page.evaluate("""(limits) => {
             try {
                 const documentClone = document.cloneNode(true);
                 const reader = new Readability(documentClone);
@@ -99,22 +268,39 @@ def extract_content_in_process(url, max_length, result_queue):
                 
                 if (!article) throw new Error("Failed to parse article");
                 
-                const links = [];
-                document.querySelectorAll('a[href]').forEach((link) => {
-                    if (link.textContent.trim() && link.href) {
-                        links.push({
-                            text: link.textContent.trim(),
-                            url: link.href,
-                            title: link.title || ''
-                        });
+                // Indexed loop with the length read once; repeated URLs are skipped
+                const collectLinks = (root) => {
+                    const nodes = root.getElementsByTagName('a');
+                    const n = nodes.length;
+                    const links = new Array(Math.min(n, limits.maxLinks));
+                    const seen = new Set();
+                    let k = 0;
+                    for (let i = 0; i < n && k < limits.maxLinks; i++) {
+                        const link = nodes[i];
+                        const url = link.href;
+                        if (!url || seen.has(url)) continue;
+                        const text = link.textContent.trim();
+                        if (text) {
+                            seen.add(url);
+                            links[k++] = {text: text.slice(0, limits.maxLinkText), url: url};
+                        }
                     }
-                });
+                    links.length = k;
+                    return links;
+                };
+                
+                // Links of the article only, from an inert copy of its HTML (Readability
+                // has made them absolute); the whole page if the article has few
+                let links = collectLinks(new DOMParser().parseFromString(article.content || '', 'text/html'));
+                if (links.length < limits.minArticleLinks) {
+                    links = collectLinks(document);
+                }
                 
                 return {
                     title: article.title || document.title,
                     byline: article.byline,
                     siteName: article.siteName,
-                    textContent: article.textContent,
+                    textContent: (article.textContent || '').slice(0, limits.maxLength),
                     excerpt: article.excerpt,
                     links: links,
                     success: true
@@ -122,54 +308,62 @@ def extract_content_in_process(url, max_length, result_queue):
             } catch (e) {
                 return { error: e.toString(), success: false };
             }
-        }""")
+        }""", limits)
         
         # Check if extraction was successful
         if not result.get("success", False):
             # Try fallback extraction
-            fallback_content = page.evaluate("""() => {
+            fallback_content = page.evaluate("""(limits) => {
                 const mainContent = document.querySelector('main') || 
                                     document.querySelector('article') || 
                                     document.querySelector('.content') || 
                                     document.querySelector('#content');
                 
-                const links = [];
-                document.querySelectorAll('a[href]').forEach((link) => {
-                    if (link.textContent.trim() && link.href) {
-                        links.push({
-                            text: link.textContent.trim(),
-                            url: link.href,
-                            title: link.title || ''
-                        });
+                // Indexed loop with the length read once; repeated URLs are skipped
+                const nodes = document.getElementsByTagName('a');
+                const n = nodes.length;
+                const links = new Array(Math.min(n, limits.maxLinks));
+                const seen = new Set();
+                let k = 0;
+                for (let i = 0; i < n && k < limits.maxLinks; i++) {
+                    const link = nodes[i];
+                    const url = link.href;
+                    if (!url || seen.has(url)) continue;
+                    const text = link.textContent.trim();
+                    if (text) {
+                        seen.add(url);
+                        links[k++] = {text: text.slice(0, limits.maxLinkText), url: url};
                     }
-                });
+                }
+                links.length = k;
                 
                 return {
-                    textContent: (mainContent || document.body).textContent,
+                    textContent: ((mainContent || document.body).textContent || '').slice(0, limits.maxLength),
                     links: links,
                     success: true
                 };
-            }""")
+            }""", limits)
             
-            text_content = fallback_content.get("textContent", "")
+            text_content = fallback_content.pop("textContent", "")
             if len(text_content) > max_length:
                 text_content = text_content[:max_length] + "...[truncated]"
             
-            result_queue.put({
+            return {
                 "title": page.title(),
                 "url": url,
                 "content": text_content,
                 "links": fallback_content.get("links", []),
                 "extraction_method": "fallback",
                 "elapsed_time": time.time() - start_time
-            })
+            }
         else:
-            # Process the successful result
-            text_content = result.get("textContent", "")
+            # Process the successful result; popping drops the dict's reference to
+            # the untruncated text, so it is freed as soon as it is sliced
+            text_content = result.pop("textContent", "")
             if len(text_content) > max_length:
                 text_content = text_content[:max_length] + "...[truncated]"
             
-            result_queue.put({
+            return {
                 "title": result.get("title", ""),
                 "url": url,
                 "byline": result.get("byline", ""),
@@ -179,63 +373,431 @@ def extract_content_in_process(url, max_length, result_queue):
                 "links": result.get("links", []),
                 "extraction_method": "readability",
                 "elapsed_time": time.time() - start_time
-            })
+            }
     
     except Exception as e:
-        print(f"Error in extraction: {str(e)}")
-        result_queue.put({
+        logger.warning("Error in extraction: %s", e)
+        return {
             "error": f"Extraction error: {str(e)}",
             "url": url,
             "elapsed_time": time.time() - start_time
-        })
+        }
     finally:
-        # Clean up Playwright resources
+        # Close the page but keep the browser for the next request
         try:
             if page:
                 page.close()
+        except Exception as e:
+            logger.warning("Error closing page: %s", e)
+
+def lower_process_priority():
+    """
+    Renice the current process and pin it to the configured CPUs.
+    
+    Firefox and the Playwright driver are started afterwards and inherit both,
+    so page loads do not preempt the assistant's own work.
+    """
+    settings = TOOL_SETTINGS.get("webpage_reader", {})
+    try:
+        os.nice(settings.get("nice", 5))
+    except (AttributeError, OSError) as e:  # os.nice does not exist on Windows
+        logger.debug("Could not lower worker priority: %s", e)
+    
+    cpus = settings.get("cpu_affinity")
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(cpus))
+        except OSError as e:
+            logger.warning("Could not set worker CPU affinity %s: %s", cpus, e)
+
+def browser_worker(slot, job_queue, result_queue, own_process=False, retired=None):
+    """
+    Worker thread or process: start Playwright and Firefox once, then extract pages from the job queue.
+    
+    Jobs are (job_id, url, max_length, deadline) tuples and None stops the worker.
+    Jobs still queued after their deadline (a time.time() value) are answered with
+    (job_id, "skipped", None), since their caller has stopped waiting; every other
+    job is answered with (job_id, "started", slot) and then (job_id, "done", result). A worker thread
+    whose retired event is set exits after its current job.
+    Once the browser runs the worker reports (None, "ready", slot); if it cannot
+    start, it reports (None, "failed", (slot, error)) and exits, and the pool
+    starts it again after a backoff.
+    Priority and CPU affinity are only changed when the worker has its own process.
+    """
+    browser_context = None
+    playwright_instance = None
+    firefox_profile, profile_lock = None, None
+    
+    if own_process:
+        lower_process_priority()
+    
+    try:
+        try:
+            firefox_profile, profile_lock = acquire_profile(slot)
+            setup_firefox_with_ublock(firefox_profile)
+            
+            # Initialize Playwright resources
+            playwright_instance = sync_playwright().start()
+            browser_context = playwright_instance.firefox.launch_persistent_context(
+                user_data_dir=firefox_profile,
+                headless=True
+            )
+            # Registered once on the context, so it applies to every page
+            browser_context.route("**/*", block_unneeded_resources)
+        except Exception as e:
+            startup_error = f"Browser startup error: {str(e)}"
+            logger.warning(startup_error)
+            result_queue.put((None, "failed", (slot, startup_error)))
+            return
+        result_queue.put((None, "ready", slot))
+        
+        while True:
+            job = job_queue.get()
+            if job is None:
+                break
+            job_id, url, max_length, deadline = job
+            if time.time() > deadline:
+                logger.debug("Skipping %s, its caller stopped waiting", url)
+                result_queue.put((job_id, "skipped", None))
+                continue
+            result_queue.put((job_id, "started", slot))
+            result = extract_content(browser_context, url, max_length)
+            result_queue.put((job_id, "done", result))
+            if retired is not None and retired.is_set():
+                break
+    finally:
+        # Clean up Playwright resources
+        try:
             if browser_context:
                 browser_context.close()
             if playwright_instance:
                 playwright_instance.stop()
         except Exception as e:
-            print(f"Error cleaning up Playwright resources: {str(e)}")
+            logger.warning("Error cleaning up Playwright resources: %s", e)
+        if firefox_profile:
+            release_profile(firefox_profile, profile_lock)
+
+# Seconds between progress messages while waiting on a worker
+PROGRESS_INTERVAL = 5
+
+# Delay before restarting a worker whose browser failed to start, doubled on each failure
+STARTUP_RETRY_SECONDS = 30
+MAX_STARTUP_RETRY_SECONDS = 600
+
+class _WorkerPool:
+    """
+    Long-lived browser workers shared by all webpage_reader calls.
+    
+    Workers are threads by default: Playwright already runs Firefox in its own
+    process, so a worker process only adds startup cost. With isolated=True they
+    are processes instead, which can be killed when a page hangs. Each process
+    then has its own queues, bridged to the pool's by a relay thread, so killing
+    one cannot corrupt a queue another worker uses.
+    """
+    
+    def __init__(self, size, isolated=False):
+        """Initialize the pool; workers start on first use."""
+        self.size = max(1, size)
+        self.isolated = isolated
+        self._lock = threading.Lock()
+        self._workers = [None] * self.size
+        self._jobs = None
+        self._results = None
+        self._collector = None
+        self._job_ids = itertools.count()
+        self._waiting = {}     # job_id -> queue.Queue receiving the result
+        self._job_slots = {}   # job_id -> slot of the worker extracting it
+        # Browser startup failures per slot, and when each failed slot may start again
+        self._failures = [0] * self.size
+        self._restart_after = [0.0] * self.size
+        # Per worker thread, set to make it exit after its current job
+        self._retired = [None] * self.size
+        self._startup_error = None
+    
+    def _start_worker(self, slot):
+        """Start (or replace) the worker in a slot."""
+        if self.isolated:
+            job_queue, result_queue = Queue(), Queue()
+            worker = Process(target=browser_worker, args=(slot, job_queue, result_queue, True), daemon=True)
+            worker.start()
+            relay_args = (worker, job_queue, result_queue)
+            threading.Thread(target=self._relay, args=relay_args, daemon=True).start()
+        else:
+            self._retired[slot] = threading.Event()
+            args = (slot, self._jobs, self._results, False, self._retired[slot])
+            worker = threading.Thread(target=browser_worker, args=args, daemon=True)
+            worker.start()
+        self._workers[slot] = worker
+    
+    def _slot_up(self, slot, now):
+        """Whether a slot has a worker that is running or starting, not one that failed."""
+        worker = self._workers[slot]
+        return worker is not None and worker.is_alive() and now >= self._restart_after[slot]
+    
+    def _ensure_started(self):
+        """
+        Start the queues, collector thread and any missing or dead workers.
+        
+        Workers whose browser failed to start are only restarted after their backoff.
+        
+        Returns:
+            Whether at least one worker is up
+        """
+        with self._lock:
+            if self._jobs is None:
+                self._jobs = queue.Queue()
+                self._results = queue.Queue()
+                self._collector = threading.Thread(target=self._collect, daemon=True)
+                self._collector.start()
+                atexit.register(self.shutdown)
+            now = time.monotonic()
+            for slot, worker in enumerate(self._workers):
+                if (worker is None or not worker.is_alive()) and now >= self._restart_after[slot]:
+                    self._start_worker(slot)
+            return any(self._slot_up(slot, now) for slot in range(self.size))
+    
+    def _relay(self, process, job_queue, result_queue):
+        """
+        Bridge a worker process to the pool's queues until the process ends.
+        
+        The process is handed one job at a time, when it is idle, so queued jobs
+        go to whichever worker frees up first.
+        """
+        idle = False
+        job = None  # Handed over but not started yet
+        try:
+            while True:
+                if idle:
+                    job = self._jobs.get()
+                    job_queue.put(job)
+                    if job is None:
+                        return
+                    idle = False
+                try:
+                    message = result_queue.get(timeout=1)
+                except queue.Empty:
+                    if not process.is_alive():
+                        # Give a job the process never started to another worker
+                        if job is not None:
+                            self._jobs.put(job)
+                        return
+                    continue
+                self._results.put(message)
+                kind = message[1]
+                if kind == "failed":
+                    return
+                job = None
+                idle = kind != "started"
+        finally:
+            # The process may have been killed; do not wait on its queues at exit
+            job_queue.cancel_join_thread()
+            job_queue.close()
+            result_queue.close()
+    
+    def _collect(self):
+        """Route worker messages to the waiting callers."""
+        while True:
+            message = self._results.get()
+            if message is None:
+                break
+            job_id, kind, payload = message
+            if job_id is None:
+                self._worker_status(kind, payload)
+                continue
+            with self._lock:
+                if kind == "started":
+                    self._job_slots[job_id] = payload
+                    continue
+                self._job_slots.pop(job_id, None)
+                waiter = self._waiting.pop(job_id, None)
+            # Results of jobs that already timed out are dropped
+            if waiter is not None:
+                waiter.put(payload)
+    
+    def _worker_status(self, kind, payload):
+        """Track worker startups; fail waiting callers at once when no worker is left."""
+        with self._lock:
+            if kind == "ready":
+                self._failures[payload] = 0
+                return
+            slot, error = payload
+            self._startup_error = error
+            self._failures[slot] += 1
+            backoff = STARTUP_RETRY_SECONDS * 2 ** (self._failures[slot] - 1)
+            now = time.monotonic()
+            self._restart_after[slot] = now + min(backoff, MAX_STARTUP_RETRY_SECONDS)
+            if any(self._slot_up(other, now) for other in range(self.size)):
+                return
+            
+            # Nobody will take the queued jobs before the backoff ends
+            waiters = list(self._waiting.values())
+            self._waiting.clear()
+            self._job_slots.clear()
+            try:
+                while True:
+                    self._jobs.get_nowait()
+            except queue.Empty:
+                pass
+        for waiter in waiters:
+            waiter.put({"error": error})
+    
+    def extract(self, url, max_length, timeout):
+        """
+        Extract a page in one of the workers.
+        
+        Returns:
+            The result dict, or None if no result arrived within timeout
+        """
+        if not self._ensure_started():
+            return {"error": self._startup_error or "No browser worker available"}
+        job_id = next(self._job_ids)
+        waiter = queue.Queue(maxsize=1)
+        with self._lock:
+            self._waiting[job_id] = waiter
+        self._jobs.put((job_id, url, max_length, time.time() + timeout))
         
-        # Clean up temporary directory
-        if temp_dir and os.path.exists(temp_dir):
+        # Block on the result; progress is reported from a separate thread
+        done = threading.Event()
+        threading.Thread(target=self._report_progress, args=(url, done), daemon=True).start()
+        try:
+            return waiter.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._waiting.pop(job_id, None)
+                slot = self._job_slots.pop(job_id, None)
+                stuck = self._workers[slot] if slot is not None else None
+                # The worker is stuck on this page; replace it. A thread cannot be
+                # killed, so it is retired instead: it exits if the page ever ends,
+                # and the replacement claims another browser profile meanwhile.
+                if slot is not None and not self.isolated:
+                    self._retired[slot].set()
+                    self._start_worker(slot)
+            if slot is not None and self.isolated:
+                # Terminating takes seconds, so the lock is not held meanwhile
+                self._stop_process(stuck)
+                with self._lock:
+                    if self._workers[slot] is stuck:
+                        self._start_worker(slot)
+            return None
+        finally:
+            done.set()
+    
+    @staticmethod
+    def _report_progress(url, done):
+        """Print how long an extraction has been running, every few seconds until it is done."""
+        start_time = time.time()
+        while not done.wait(PROGRESS_INTERVAL):
+            logger.debug("Still extracting %s (%.0fs)", url, time.time() - start_time)
+    
+    @staticmethod
+    def _stop_process(process):
+        """Terminate a worker process; worker threads only stop through the job queue."""
+        if process and process.is_alive():
             try:
-                shutil.rmtree(temp_dir, ignore_errors=True)
+                process.terminate()
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.kill()
+                    process.join(timeout=1)
             except Exception as e:
-                print(f"Error cleaning up temp directory: {str(e)}")
+                logger.warning("Error terminating process: %s", e)
+    
+    def shutdown(self):
+        """Stop all workers and the collector thread."""
+        with self._lock:
+            if self._jobs is None:
+                return
+            for _ in self._workers:
+                self._jobs.put(None)
+            for worker in self._workers:
+                if worker:
+                    worker.join(timeout=5)
+            if self.isolated:
+                for worker in self._workers:
+                    self._stop_process(worker)
+            self._results.put(None)
+            self._jobs = None
+
+# Concurrent pages for webpage_reader_batch when it uses the requests fallback
+BATCH_CONCURRENCY = 8
+
+# Recent successful extractions by (url, max_length), always on and in memory only;
+# the optional disk cache (TOOL_SETTINGS["cache_enabled"]) sits in front of it
+RESULT_CACHE_TTL = 600
+RESULT_CACHE_SIZE = 128
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+# Global instance; the worker count and isolation come from TOOL_SETTINGS["webpage_reader"]
+_worker_pool = _WorkerPool(
+    TOOL_SETTINGS.get("webpage_reader", {}).get("workers", 2),
+    isolated=TOOL_SETTINGS.get("webpage_reader", {}).get("strict_isolation", False)
+)
+
+def parse_with_selectolax(html):
+    """Get the title, links and main text of a page with selectolax (Lexbor, written in C)"""
+    tree = SelectolaxHTMLParser(html)
+    
+    # Find main content or use body
+    main_content = tree.css_first(MAIN_CONTENT_SELECTOR) or tree.body
+    
+    title_node = tree.css_first("title")
+    title = title_node.text() if title_node else "No title"
+    links = []
+    for link in tree.css("a[href]"):
+        text = link.text().strip()
+        if text:
+            links.append({"text": text, "url": link.attributes.get("href")})
+    text_content = main_content.text(separator='\n', strip=True) if main_content else ""
+    return title, links, text_content
+
+def parse_with_lxml(html):
+    """Get the title, links and main text of a page with lxml and precompiled XPath queries"""
+    doc = lxml_html.fromstring(html)
+    
+    # Find main content or use body
+    main_content = _MAIN_XPATH(doc)
+    main_content = main_content[0] if main_content else doc.find(".//body")
+    if main_content is None:
+        main_content = doc
+    
+    title = doc.findtext(".//title") or "No title"
+    links = [{"text": link.text_content().strip(), "url": link.get("href")} for link in _LINK_XPATH(doc)]
+    text_content = "\n".join(text.strip() for text in _TEXT_XPATH(main_content) if text.strip())
+    return title, links, text_content
+
+def parse_with_beautifulsoup(html):
+    """Get the title, links and main text of a page with BeautifulSoup"""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find main content or use body
+    main_content = soup.select_one(MAIN_CONTENT_SELECTOR) or soup.body
+    
+    # Extract data
+    title = soup.title.text if soup.title else "No title"
+    links = [{"text": link.text.strip(), "url": link['href']} 
+             for link in soup.find_all('a', href=True) if link.text.strip()]
+    text_content = main_content.get_text(separator='\n', strip=True)
+    return title, links, text_content
 
 def fallback_extraction(url):
-    """Simple fallback extraction using requests and BeautifulSoup"""
+    """Simple fallback extraction using requests and the fastest installed parser (selectolax, lxml, BeautifulSoup)"""
     start_time = time.time()
     
     try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        print(f"Using fallback extraction for {url}")
+        logger.debug("Using fallback extraction for %s", url)
         
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=HTTP_TIMEOUT)
+        response = _SESSION.get(url, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find main content or use body
-        main_content = None
-        for selector in ['main', 'article', '.content', '#content', '.post', '.entry']:
-            content = soup.select_one(selector)
-            if content:
-                main_content = content
-                break
-        main_content = main_content or soup.body
-        
-        # Extract data
-        title = soup.title.text if soup.title else "No title"
-        links = [{"text": link.text.strip(), "url": link['href']} 
-                 for link in soup.find_all('a', href=True) if link.text.strip()]
-        text_content = main_content.get_text(separator='\n', strip=True)
+        if SELECTOLAX_AVAILABLE:
+            title, links, text_content = parse_with_selectolax(response.text)
+        elif LXML_AVAILABLE:
+            title, links, text_content = parse_with_lxml(response.text)
+        else:
+            title, links, text_content = parse_with_beautifulsoup(response.text)
         
         elapsed_time = time.time() - start_time
         return {
@@ -249,7 +811,7 @@ def fallback_extraction(url):
         }
     except ImportError:
         return {
-            "error": "Fallback extraction requires requests and BeautifulSoup",
+            "error": "Fallback extraction requires selectolax, lxml or BeautifulSoup",
             "url": url,
             "elapsed_time": time.time() - start_time,
             "_tool_status": "❌ Error: Fallback extraction requires additional packages"
@@ -276,113 +838,111 @@ def fallback_extraction(url):
         "required": ["url"]
     }
 )
+@memoize_tool(ttl=3600)
 def execute(url, max_length=128000):
-    """Extract readable content from a webpage using Mozilla's Readability.js with improved resource management"""
+    """Extract readable content from a webpage, reusing results from the last few minutes"""
+    key = (url, max_length)
+    now = time.time()
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+        if cached is not None and now - cached[0] < RESULT_CACHE_TTL:
+            _result_cache.move_to_end(key)
+            result = dict(cached[1])
+            result["_tool_status"] = f"{result.get('_tool_status', '✓ webpage_reader: Extracted content')} (cached)"
+            return result
+    
+    result = extract_page(url, max_length)
+    if "error" not in result:
+        with _result_cache_lock:
+            _result_cache[key] = (time.time(), dict(result))
+            _result_cache.move_to_end(key)
+            while len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+    return result
+
+def extract_page(url, max_length=128000):
+    """Extract readable content from a webpage using Mozilla's Readability.js in a persistent browser worker"""
     start_time = time.time()
-    process = None
     
     # Check if Playwright is available
     if not PLAYWRIGHT_AVAILABLE:
-        print("Playwright not available, using fallback extraction")
+        logger.debug("Playwright not available, using fallback extraction")
         return fallback_extraction(url)
     
-    print(f"Extracting content from: {url}")
-    result_queue = Queue()
+    logger.debug("Extracting content from: %s", url)
     
     try:
-        # Create and start extraction process
-        process = Process(target=extract_content_in_process, args=(url, max_length, result_queue))
-        process.daemon = True
-        process.start()
-        
-        # Wait for process with timeout (45 sec minimum or 3x HTTP_TIMEOUT)
+        # Wait for the result with timeout (45 sec minimum or 3x HTTP_TIMEOUT)
         timeout = max(45, HTTP_TIMEOUT * 3)
-        last_progress = start_time
-        end_time = start_time + timeout  # Calculate the absolute end time
-        
-        print(f"Waiting up to {timeout} seconds for extraction...")
-        
-        # Loop until either we get a result, timeout expires, or process ends
-        while process.is_alive() and time.time() < end_time:
-            # Show progress periodically
-            current_time = time.time()
-            if current_time - last_progress >= 5:
-                elapsed = current_time - start_time
-                print(f"Still extracting... ({elapsed:.1f}s elapsed, timeout in {end_time - current_time:.1f}s)")
-                last_progress = current_time
-                
-            # Check for result
-            if not result_queue.empty():
-                break
-            time.sleep(0.1)
-        
-        # Handle timeout or get result
+        logger.debug("Waiting up to %s seconds for extraction...", timeout)
+        result = _worker_pool.extract(url, max_length, timeout)
         elapsed_time = time.time() - start_time
         
-        if process.is_alive() and time.time() >= end_time:
-            print(f"Extraction timed out after {elapsed_time:.1f}s (limit: {timeout}s)")
+        if result is None:
+            logger.warning("Extraction timed out after %.1fs (limit: %ss)", elapsed_time, timeout)
             
             # Try fallback
-            try:
-                import requests
-                print("Trying fallback method")
-                result = fallback_extraction(url)
-                result["_tool_status"] = f"⚠️ webpage_reader: Extraction timed out after {elapsed_time:.1f}s. {result.get('_tool_status', '')}"
-                return result
-            except ImportError:
-                return {
-                    "error": f"Extraction timed out after {elapsed_time:.1f}s",
-                    "url": url,
-                    "_tool_status": f"⚠️ webpage_reader: Extraction timed out after {elapsed_time:.1f}s"
-                }
+            logger.debug("Trying fallback method")
+            result = fallback_extraction(url)
+            result["_tool_status"] = f"⚠️ webpage_reader: Extraction timed out after {elapsed_time:.1f}s. {result.get('_tool_status', '')}"
+            return result
         
-        # Process ended or we have a result
-        if not result_queue.empty():
-            result = result_queue.get()
-            total_time = time.time() - start_time
-            
-            # Add success status if not an error
-            if "error" not in result:
-                result["_tool_status"] = f"✓ webpage_reader: Extracted content in {total_time:.2f}s using {result.get('extraction_method', 'unknown')} method"
-            else:
-                result["_tool_status"] = f"❌ Error: {result.get('error', 'Unknown error')}"
-            
+        if "error" in result:
+            # The browser could not start or read the page; try the plain HTTP fetch
+            logger.warning("Browser extraction failed: %s", result["error"])
+            error = result["error"]
+            result = fallback_extraction(url)
+            result["_tool_status"] = f"⚠️ webpage_reader: {error}. {result.get('_tool_status', '')}"
             return result
-        else:
-            # Process ended but no result was produced
-            print(f"Process ended after {elapsed_time:.1f}s with no result")
-            try:
-                import requests
-                print("Trying fallback extraction method")
-                return fallback_extraction(url)
-            except ImportError:
-                return {
-                    "error": "Extraction ended with no result",
-                    "url": url,
-                    "_tool_status": "⚠️ webpage_reader: Extraction failed with no result"
-                }
+        
+        result["_tool_status"] = f"✓ webpage_reader: Extracted content in {elapsed_time:.2f}s using {result.get('extraction_method', 'unknown')} method"
+        return result
     except Exception as e:
-        print(f"Error in webpage_reader: {str(e)}")
+        logger.warning("Error in webpage_reader: %s", e)
         return {
             "error": f"Error in webpage_reader: {str(e)}",
             "url": url,
             "_tool_status": f"❌ Error: {str(e)}"
         }
-    finally:
-        # Ensure process is properly terminated
-        if process and process.is_alive():
-            try:
-                process.terminate()
-                process.join(timeout=5)
-                if process.is_alive():
-                    process.kill()
-                    process.join(timeout=1)
-            except Exception as e:
-                print(f"Error terminating process: {e}")
+
+@tool(
+    name="webpage_reader_batch",
+    description="Extract clean, readable content from several webpages at once. Prefer this over repeated webpage_reader calls when reading multiple pages.",
+    parameters={
+        "urls": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "The URLs of the webpages to extract content from."
+        }
+    }
+)
+def execute_batch(urls, max_length=128000):
+    """Extract several webpages concurrently, one browser worker per page at a time"""
+    start_time = time.time()
+    if not urls:
+        return {
+            "error": "No URLs provided",
+            "_tool_status": "❌ Error: webpage_reader_batch needs at least one URL"
+        }
+    
+    # More concurrent pages than browser workers would only queue up and eat into the timeout
+    concurrency = _worker_pool.size if PLAYWRIGHT_AVAILABLE else BATCH_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=min(len(urls), concurrency)) as executor:
+        pages = list(executor.map(lambda url: execute(url, max_length), urls))
+    
+    for page in pages:
+        page.pop("_tool_status", None)
+    extracted = sum(1 for page in pages if "error" not in page)
+    elapsed_time = time.time() - start_time
+    return {
+        "pages": pages,
+        "_tool_status": f"✓ webpage_reader_batch: Extracted {extracted} of {len(urls)} pages in {elapsed_time:.2f}s"
+    }
 
 # Make sure multiprocessing works correctly on Windows
 if __name__ == "__main__":
     multiprocessing.freeze_support()
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     
     # Simple test if run directly
     if len(sys.argv) > 1:
@@ -0,0 +1,78 @@
+# utils_numeric.py
+"""Numeric helpers, JIT-compiled with Numba when it is installed."""
+
+# numpy backs the vector helpers; it comes with the semantic cache extra
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Numba compiles the hot loops; cache=True keeps the compiled code on disk between runs
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def bar_fill(percentage: float, length: int) -> int:
+    """
+    Number of filled cells of a progress bar.
+
+    This runs once per prompt, so it stays plain Python: a JIT call would cost
+    more in dispatch than the arithmetic it replaces.
+
+    Args:
+        percentage: Fill percentage, clamped to 0-100
+        length: Total number of cells
+
+    Returns:
+        The number of filled cells
+    """
+    return int(length * min(max(percentage, 0.0), 100.0) / 100)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _dot_scores(matrix, query):
+        """Dot product of every row of matrix with query."""
+        rows, cols = matrix.shape
+        scores = np.empty(rows, dtype=np.float32)
+        for i in range(rows):
+            total = 0.0
+            for j in range(cols):
+                total += matrix[i, j] * query[j]
+            scores[i] = total
+        return scores
+
+
+def cosine_topk(matrix, query, k: int = 1):
+    """
+    Find the rows of matrix most similar to query.
+
+    Rows and query must already be normalized, so the dot product is the cosine
+    similarity. This scan over every cached embedding is the part worth
+    compiling; without Numba it falls back to a numpy matrix product.
+
+    Args:
+        matrix: 2-D float32 array with one normalized embedding per row
+        query: 1-D float32 normalized embedding
+        k: Number of matches to return
+
+    Returns:
+        Tuple of (row indices, scores), best match first
+    """
+    if NUMBA_AVAILABLE:
+        scores = _dot_scores(np.ascontiguousarray(matrix), np.ascontiguousarray(query))
+    else:
+        scores = matrix @ query
+
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    # Partial selection, then sort only the k winners
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
@@ -1,4 +1,30 @@
+import os
+import pkgutil
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithAgentManifest(build_py):
+    """Generate agents/_agent_manifest.py so agent discovery can skip the directory scan."""
+
+    def run(self):
+        super().run()
+
+        # Editable installs keep scanning the source tree so new agents are picked up
+        if getattr(self, "editable_mode", False):
+            return
+
+        agents_dir = os.path.join("agentic_assistant", "agents")
+        skipped = {"registry", "base_agent", "_agent_manifest"}
+        modules = sorted(module.name for module in pkgutil.iter_modules([agents_dir])
+                         if module.name not in skipped)
+
+        target = os.path.join(self.build_lib, agents_dir, "_agent_manifest.py")
+        with open(target, "w", encoding="utf-8") as f:
+            f.write("# Generated by setup.py at build time. Do not edit.\n")
+            f.write(f"AGENT_MODULES = {tuple(modules)!r}\n")
+
 
 setup(
     name="agentic_assistant",
@@ -7,19 +33,24 @@ setup(
     author="Arthur B",
     packages=find_packages(),
     include_package_data=True,
+    package_data={
+        "agentic_assistant": ["vendor/*.js", "vendor/*.LICENSE"],  # Readability.js, injected into pages
+    },
     python_requires=">=3.8",
     install_requires=[
         # Core dependencies
-        "openai>=1.0.0",  # For LLM API interaction
-        "requests>=2.25.0",  # For HTTP requests
+        "openai>=1.0.0,<3.0",  # For LLM API interaction
+        "requests>=2.25.0,<3.0",  # For HTTP requests
+        "orjson>=3.6.0,<4.0",  # For fast JSON in the message path
+        "brotli>=1.0.9,<2.0",  # For brotli-compressed HTTP responses
         
         # Web extraction dependencies
-        "playwright>=1.30.0",  # For advanced web extraction
-        "beautifulsoup4>=4.9.0",  # For fallback web extraction
+        "playwright>=1.30.0,<2.0",  # For advanced web extraction
+        "beautifulsoup4>=4.9.0,<5.0",  # For fallback web extraction
         
         # Optional but recommended
-        "tqdm>=4.60.0",  # For progress bars
-        "colorama>=0.4.4",  # For colored terminal output
+        "tqdm>=4.60.0,<5.0",  # For progress bars
+        "colorama>=0.4.4,<1.0",  # For colored terminal output
     ],
     extras_require={
         "dev": [
@@ -27,6 +58,18 @@ setup(
             "black>=22.0.0",
             "flake8>=4.0.0",
         ],
+        "semantic_cache": [
+            "sentence-transformers>=2.2.0",  # For semantic response caching
+            "numpy>=1.21.0",
+            "numba>=0.56.0",  # Optional, compiles the similarity search
+        ],
+        "fast": [
+            "selectolax>=0.3.0,<2.0",  # For faster fallback web extraction
+            "lxml>=4.6.0,<7.0",  # XPath-based fallback when selectolax is missing
+        ],
+    },
+    cmdclass={
+        "build_py": BuildPyWithAgentManifest,
     },
     entry_points={
         "console_scripts": [